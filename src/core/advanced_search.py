@@ -20,6 +20,15 @@ from .directory_manager import DirectoryManager
 from .markdown_engine import MarkdownEngine, MemoryEntry
 
 
+# 各匹配类型在最终排序中的权重，未知类型使用0.5
+_MATCH_TYPE_WEIGHTS = {
+    'exact': 1.0,
+    'semantic': 0.8,
+    'tag': 0.6,
+    'related': 0.4
+}
+
+
 @dataclass
 class SearchResult:
     """搜索结果"""
@@ -577,13 +586,7 @@ class AdvancedSearchEngine:
                     pass  # 忽略时间解析错误
             
             # 匹配类型加权
-            type_weights = {
-                'exact': 1.0,
-                'semantic': 0.8,
-                'tag': 0.6,
-                'related': 0.4
-            }
-            type_weight = type_weights.get(result.match_type, 0.5)
+            type_weight = _MATCH_TYPE_WEIGHTS.get(result.match_type, 0.5)
             score *= type_weight
             
             return score
@@ -160,7 +160,7 @@ class CollaborationManager:
         
         # 协作数据目录
         self.collaboration_dir = self.base_path / "collaboration"
-        self.collaboration_dir.mkdir(exist_ok=True)
+        self.collaboration_dir.mkdir(parents=True, exist_ok=True)
         
         # 权限和项目存储
         self.permissions_file = self.collaboration_dir / "permissions.json"
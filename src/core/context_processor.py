@@ -9,20 +9,398 @@ ContextX上下文处理器
 - 集成增强评分算法用于智能记忆选择
 """
 
+import os
 import re
+import copy
 import json
+import heapq
+import logging
+from bisect import bisect_right
+from itertools import filterfalse
+from operator import add, attrgetter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterator, Callable
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 
 from .markdown_engine import MarkdownEngine, MemoryEntry, ContextSection
-from .directory_manager import DirectoryManager
+from .directory_manager import DirectoryManager, MTIME_SETTLE_NS, _mtime_settled
+from .keyword_matcher import KeywordMatcher
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # 增强评分算法配置
 ENABLE_ENHANCED_SCORING = True  # 是否启用增强评分算法
-ENHANCED_SCORING_DEBUG = True  # 是否显示增强评分的调试信息
+ENHANCED_SCORING_DEBUG = False  # 已废弃：设为True等同于把本模块logger设为DEBUG级别
+
+# 记忆数量达到该值时才使用NumPy列式过滤，数量较少时构建数组的开销得不偿失
+NUMPY_FILTER_MIN_MEMORIES = 256
+
+# 情景记忆文件数超过该值时使用线程池并行读取，文件较少时线程调度开销得不偿失
+PARALLEL_EPISODIC_MIN_FILES = 4
+PARALLEL_EPISODIC_MAX_WORKERS = 8
+
+# generate_context结果的LRU缓存容量，相同配置且团队文件未变化时直接复用
+CONTEXT_CACHE_SIZE = 32
+
+# 相关性评分和关键词提取结果的LRU缓存容量
+RELEVANCE_CACHE_SIZE = 4096
+
+# 热路径上的调试输出统一走logging，日志级别由应用入口配置
+logger = logging.getLogger(__name__)
+
+
+def _apply_debug_flag() -> None:
+    """兼容已废弃的ENHANCED_SCORING_DEBUG开关：为True时打开本模块的DEBUG日志"""
+    if ENHANCED_SCORING_DEBUG and logger.level != logging.DEBUG:
+        logger.setLevel(logging.DEBUG)
+
+
+# 七阶段框架各阶段对应的文件名
+_STAGE_FILES = MappingProxyType({
+    "overview": "00_overview.md",
+    "requirements": "01_requirements.md",
+    "business-model": "02_business_model.md",
+    "solution": "03_solution.md",
+    "structure": "04_structure.md",
+    "tasks": "05_tasks.md",
+    "common-tasks": "06_common_tasks.md",
+    "constraints": "07_constraints.md"
+})
+
+# 默认包含的七个框架阶段（按输出顺序）
+_DEFAULT_FRAMEWORK_STAGES = (
+    "requirements", "business-model", "solution", "structure",
+    "tasks", "common-tasks", "constraints"
+)
+
+# 过滤停用词 - 扩展列表，过滤更多无关词汇
+_STOP_WORDS = frozenset({
+    # 英文停用词
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his',
+    'get', 'make', 'go', 'come', 'know', 'think', 'see', 'want', 'use', 'find', 'give', 'tell', 'work',
+    'call', 'try', 'ask', 'need', 'feel', 'become', 'leave', 'put', 'mean', 'keep', 'let', 'begin',
+    # 中文停用词
+    '我', '你', '他', '她', '它', '我们', '你们', '他们', '的', '了', '在', '是', '有', '这', '那',
+    '一个', '请', '帮', '我要', '需要', '希望', '可以', '如何', '怎么', '什么', '为什么', '因为',
+    '所以', '但是', '然后', '现在', '已经', '还是', '就是', '都是', '不是', '没有', '也是', '或者',
+    '其他', '其它', '一些', '很多', '非常', '特别', '比较', '觉得', '应该', '可能', '一直', '总是',
+    '从来', '从不', '永远', '马上', '立即', '现在', '以前', '以后', '今天', '明天', '昨天'
+})
+
+_ENGLISH_WORD_RE = re.compile(r'[a-z]+')
+_NON_CHINESE_RE = re.compile(r'[^\u4e00-\u9fa5]')
+
+# 常见的技术术语和概念
+_TECH_PATTERNS = [
+    '工作流', 'workflow', 'API', 'api', '接口', '数据库', 'database',
+    '认证', 'authentication', '权限', 'authorization', '管理', 'management',
+    '服务', 'service', '查询', 'query', '分页', 'pagination',
+    '架构', 'architecture', '实现', 'implementation', '配置', 'configuration',
+    '框架', 'framework', '模型', 'model', '业务', 'business',
+    '流程', 'process', '功能', 'feature', '模块', 'module', '组件', 'component',
+    'Rule', 'rule', 'Solution', 'solution', 'Prompt', 'prompt'
+]
+
+# 多关键词匹配器只在导入时构建一次，每篇文本单次扫描即可找出所有关键词
+_TECH_MATCHER = KeywordMatcher(pattern.lower() for pattern in _TECH_PATTERNS)
+
+# 语义相关性评分使用的词表和正则，导入时构建并编译一次
+_DOMAIN_KEYWORDS = frozenset([
+    'api', 'workflow', 'solution', 'rule', 'step', 'validation', 'model',
+    'architecture', 'design', 'service', 'id', 'reference', 'create', 'update'
+])
+
+# (问题词, 解决方案词)
+_PROBLEM_SOLUTION_PAIRS = (
+    (frozenset(['enhance', 'improve', 'add', 'support']), ('design', 'architecture', 'implementation', 'approach')),
+    (frozenset(['validate', 'check', 'ensure']), ('validation', 'verification', 'logic', 'mechanism')),
+    (frozenset(['reference', 'link', 'connect']), ('relationship', 'mapping', 'association', 'routing')),
+    (frozenset(['create', 'build', 'generate']), ('creation', 'construction', 'generation', 'workflow')),
+    (frozenset(['model', 'structure', 'entity']), ('class', 'inheritance', 'hierarchy', 'design'))
+)
+
+# 复合概念的语义映射：(用户消息中的模式, 记忆中的模式)
+_CONCEPT_MAPPINGS = (
+    # Solution as step 核心概念
+    (('solution as step', 'solution.*step', 'setting solution.*step'),
+     ('orderedsteps', 'step.*solution', 'solution.*workflow', 'list.*string')),
+    
+    # Reference and ID concepts
+    (('solution reference', 'solution.*id', 'reference.*solution'),
+     ('id.*prefix', 'prefix.*identification', 's_.*uuid', 'service.*routing')),
+    
+    # Validation concepts
+    (('validate.*solution', 'ensure.*valid', 'validate.*exist'),
+     ('validation.*logic', 'exist.*rule', 'prompt.*exist', 'routing.*service')),
+    
+    # Workflow creation concepts
+    (('workflow creation', 'creating workflow', 'workflow.*api'),
+     ('create.*workflow', 'workflow.*design', 'api.*design', 'controller.*service')),
+    
+    # Data model concepts
+    (('data model', 'dto.*entit', 'model.*support'),
+     ('inherit.*relation', 'class.*design', 'architecture.*design', 'prompt.*base'))
+)
+_CONCEPT_USER_REGEXES = tuple(tuple(re.compile(p) for p in user_patterns) for user_patterns, _ in _CONCEPT_MAPPINGS)
+# 用户侧模式：(字面片段, 需要再校验片段顺序时使用的正则)；纯字面模式直接做子串判断
+_CONCEPT_USER_CHECKS = tuple(
+    tuple(
+        (tuple(pattern.split('.*')), regex if '.*' in pattern else None)
+        for pattern, regex in zip(user_patterns, user_regexes)
+    )
+    for (user_patterns, _), user_regexes in zip(_CONCEPT_MAPPINGS, _CONCEPT_USER_REGEXES)
+)
+_CONCEPT_MEMORY_REGEXES = tuple(tuple(re.compile(p) for p in memory_patterns) for _, memory_patterns in _CONCEPT_MAPPINGS)
+
+_TECH_STACK_KEYWORDS = (
+    'dto', 'entity', 'controller', 'service', 'repository', 'database',
+    'validation', 'routing', 'prefix', 'inheritance', 'polymorphism'
+)
+
+# 语义评分词表中的每个词对应一个比特位，记忆和消息各自压缩成整数掩码后，
+# 逐词的子串判断就变成按位与加计数
+# 复合概念的记忆侧模式只由字面片段和'.*'组成，字面片段也并入词表，
+# 这样领域概念、解决方案词、技术栈词和复合概念都在同一次扫描中完成
+_CONCEPT_MEMORY_PARTS = tuple(
+    tuple(tuple(pattern.split('.*')) for pattern in memory_patterns) for _, memory_patterns in _CONCEPT_MAPPINGS
+)
+_SEMANTIC_VOCAB = tuple(sorted(
+    _DOMAIN_KEYWORDS.union(
+        _TECH_STACK_KEYWORDS,
+        *(solution_words for _, solution_words in _PROBLEM_SOLUTION_PAIRS),
+        *(parts for concept_parts in _CONCEPT_MEMORY_PARTS for parts in concept_parts)
+    )
+))
+_SEMANTIC_BITS = {word: 1 << i for i, word in enumerate(_SEMANTIC_VOCAB)}
+_SEMANTIC_MATCHER = KeywordMatcher(_SEMANTIC_VOCAB)
+# 每个记忆侧模式：(必须同时出现的字面片段掩码, 需要再校验片段顺序时使用的正则)
+_CONCEPT_MEMORY_CHECKS = tuple(
+    tuple(
+        (sum(_SEMANTIC_BITS[part] for part in set(parts)), regex if len(parts) > 1 else None)
+        for parts, regex in zip(concept_parts, memory_regexes)
+    )
+    for concept_parts, memory_regexes in zip(_CONCEPT_MEMORY_PARTS, _CONCEPT_MEMORY_REGEXES)
+)
+_SOLUTION_MASKS = tuple(
+    sum(_SEMANTIC_BITS[word] for word in set(solution_words)) for _, solution_words in _PROBLEM_SOLUTION_PAIRS
+)
+
+# 问题词按同样方式编码，消息关键词的掩码与之按位与即可判断消息是否提出了该类问题
+_PROBLEM_BITS = {
+    word: 1 << i
+    for i, word in enumerate(sorted(set().union(*(problem_words for problem_words, _ in _PROBLEM_SOLUTION_PAIRS))))
+}
+_PROBLEM_MASKS = tuple(
+    sum(_PROBLEM_BITS[word] for word in problem_words) for problem_words, _ in _PROBLEM_SOLUTION_PAIRS
+)
+
+
+# 关键词数量不超过该值时为消息生成展开后的专用计数函数，否则使用通用循环
+SPECIALIZED_COUNTER_MAX_KEYWORDS = 128
+
+
+def _build_hit_counter(message_keywords: List[str], phrases: Tuple[str, ...]) -> Callable[..., Tuple[int, int, int, int]]:
+    """
+    为一组消息关键词构建原始评分算法1-4项的命中计数函数
+    
+    同一条消息会对所有候选记忆评分，关键词集合固定不变：把关键词作为字面量展开成一串
+    平铺的in判断并编译成函数，省去每条记忆上对关键词列表的Python循环。
+    
+    返回函数签名为 count_hits(tags_lc, section_hits, project_lc, check_project)，
+    section_hits为内容、各标签、项目名分段命中的关键词集合，
+    返回 (标签命中数, 内容命中数, 项目名命中数, 短语命中数)。
+    """
+    if len(message_keywords) > SPECIALIZED_COUNTER_MAX_KEYWORDS:
+        def count_hits(tags_lc, section_hits, project_lc, check_project):
+            content_hits = section_hits[0]
+            tag_count = sum(1 for tag_lower, tag_hits in zip(tags_lc, section_hits[1:])
+                            for keyword in message_keywords if keyword in tag_hits or tag_lower in keyword)
+            project_count = 0
+            if check_project:
+                project_hits = section_hits[-1]
+                project_count = sum(1 for keyword in message_keywords
+                                    if keyword in project_hits or project_lc in keyword)
+            content_count = sum(1 for keyword in message_keywords if keyword in content_hits)
+            phrase_count = sum(1 for phrase in phrases if phrase in content_hits)
+            return tag_count, content_count, project_count, phrase_count
+        return count_hits
+    
+    literals = [repr(keyword) for keyword in message_keywords]
+    
+    def total(terms) -> str:
+        return ' + '.join(['0', *terms])
+    
+    source = (
+        "def count_hits(tags_lc, section_hits, project_lc, check_project):\n"
+        "    content_hits = section_hits[0]\n"
+        "    # 1. 标签匹配\n"
+        "    tag_count = 0\n"
+        "    for tag_lower, tag_hits in zip(tags_lc, section_hits[1:]):\n"
+        f"        tag_count += {total(f'({k} in tag_hits or tag_lower in {k})' for k in literals)}\n"
+        "    # 2. 内容关键词匹配\n"
+        f"    content_count = {total(f'({k} in content_hits)' for k in literals)}\n"
+        "    # 3. 项目名匹配\n"
+        "    project_count = 0\n"
+        "    if check_project:\n"
+        "        project_hits = section_hits[-1]\n"
+        f"        project_count = {total(f'({k} in project_hits or project_lc in {k})' for k in literals)}\n"
+        "    # 4. 完整短语匹配\n"
+        f"    phrase_count = {total(f'({phrase!r} in content_hits)' for phrase in phrases)}\n"
+        "    return tag_count, content_count, project_count, phrase_count\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, '<keyword-hit-counter>', 'exec'), namespace)
+    return namespace['count_hits']
+
+
+# 增强评分引擎依赖较重，首次使用时才导入；None表示导入失败，之后不再重试
+_ENHANCED_ENGINE_NOT_LOADED = object()
+_enhanced_engine_classes: Any = _ENHANCED_ENGINE_NOT_LOADED
+
+
+def _load_enhanced_scoring_classes() -> Optional[Tuple[type, type]]:
+    """返回(SelfLearningMemoryScoringEngine, MemoryItem)，增强评分引擎不可用时返回None"""
+    global _enhanced_engine_classes
+    if _enhanced_engine_classes is _ENHANCED_ENGINE_NOT_LOADED:
+        try:
+            from src.scoring_self_evolution import SelfLearningMemoryScoringEngine, MemoryItem
+            _enhanced_engine_classes = (SelfLearningMemoryScoringEngine, MemoryItem)
+        except ImportError:
+            _enhanced_engine_classes = None
+    return _enhanced_engine_classes
+
+
+def _lru_get(cache: 'OrderedDict', key):
+    """读取LRU缓存，命中时将条目移到最近使用的位置"""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: 'OrderedDict', key, value, max_size: Optional[int] = None):
+    """写入LRU缓存，超出容量（默认RELEVANCE_CACHE_SIZE）时淘汰最久未使用的条目"""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > (max_size or RELEVANCE_CACHE_SIZE):
+        cache.popitem(last=False)
+
+
+def _popcount(mask: int) -> int:
+    """统计掩码中置位的比特数"""
+    return bin(mask).count('1')
+
+
+def _semantic_mask(memory: MemoryEntry) -> int:
+    """首次访问时计算并缓存记忆文本（内容+标签）中出现的语义词表掩码"""
+    mask = getattr(memory, '_semantic_mask', None)
+    if mask is None:
+        mask = 0
+        for keyword in _SEMANTIC_MATCHER.matches(_ensure_lowercase(memory)._text_lc):
+            mask |= _SEMANTIC_BITS[keyword]
+        memory._semantic_mask = mask
+    return mask
+
+
+def _importance_weight(memory: MemoryEntry) -> float:
+    """重要性归一化到相对权重（importance / 3.0），首次访问时缓存"""
+    weight = getattr(memory, '_importance_weight', None)
+    if weight is None:
+        weight = memory._importance_weight = memory.importance / 3.0
+    return weight
+
+
+def _ensure_lowercase(memory: MemoryEntry) -> MemoryEntry:
+    """首次访问时缓存记忆内容和标签的小写形式（记忆每次重新加载都是新对象，缓存随之失效）"""
+    if not hasattr(memory, '_content_lc'):
+        memory._content_lc = memory.content.lower()
+        memory._tags_lc = tuple(tag.lower() for tag in memory.tags)
+        memory._project_lc = (memory.project or '').lower()
+        # 内容和标签拼接后的小写文本，供语义评分使用
+        memory._text_lc = memory._content_lc + ' ' + ' '.join(memory._tags_lc)
+        # 内容、各标签、项目名用\x01拼接，关键词匹配只需扫描一次；
+        # _section_starts记录各分段起点：分段0为内容，1..T为各标签，T+1为项目名
+        memory._sections_lc = '\x01'.join((memory._content_lc,) + memory._tags_lc + (memory._project_lc,))
+        section_starts = [0]
+        offset = len(memory._content_lc) + 1
+        for tag_lc in memory._tags_lc:
+            section_starts.append(offset)
+            offset += len(tag_lc) + 1
+        section_starts.append(offset)
+        memory._section_starts = section_starts
+    return memory
+
+
+# 常见重要性（0-10）对应的星级文本，渲染时查表共享同一个字符串
+_STAR_STRINGS = tuple('⭐' * i for i in range(11))
+
+
+def _display_fields(memory: MemoryEntry) -> Tuple[str, str]:
+    """首次渲染时缓存记忆的星级和标签展示文本"""
+    try:
+        return memory._stars, memory._tags_joined
+    except AttributeError:
+        importance = memory.importance
+        memory._stars = (_STAR_STRINGS[importance] if 0 <= importance < len(_STAR_STRINGS)
+                         else '⭐' * importance)
+        memory._tags_joined = ', '.join(memory.tags)
+        return memory._stars, memory._tags_joined
+
+
+# 标准库回退路径复用同一个编码器，json.dumps带参数时每次调用都会新建JSONEncoder
+_METADATA_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _dumps_metadata(metadata: Dict[str, Any]) -> str:
+    """将元数据序列化为缩进2格的JSON文本，优先使用orjson"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            # 非字符串键、超大整数等orjson不支持的数据回退到标准库
+            pass
+    return _METADATA_JSON_ENCODER.encode(metadata)
+
+
+def _memory_section(memory: MemoryEntry, heading_prefix: str = "",
+                    include_timestamp: bool = False) -> Tuple[str, str, str]:
+    """
+    渲染单条记忆的内容片段：固定的短行预先拼成一段，记忆正文单独成段不复制
+    
+    Args:
+        heading_prefix: 放在记忆标题之前的文本（混合模式为"#团队记忆\n"）
+        include_timestamp: 是否输出时间戳行（仅记忆模式输出）
+    """
+    stars, tags_joined = _display_fields(memory)
+    timestamp_line = f"**Timestamp:** {memory.timestamp}\n" if include_timestamp else ""
+    return (
+        f"{heading_prefix}"
+        f"### {memory.id}\n"
+        f"**Project:** {memory.project}\n"
+        f"**Importance:** {stars}\n"
+        f"**Tags:** {tags_joined}\n"
+        f"{timestamp_line}",
+        memory.content,
+        _SECTION_SEPARATOR
+    )
 
 
 class ContextMode(Enum):
@@ -54,10 +432,7 @@ class ContextGenerationConfig:
     include_team_memories: bool = True  # 新增：是否包含团队级别的通用记忆
     
     # 框架相关配置
-    include_framework_stages: List[str] = field(default_factory=lambda: [
-        "requirements", "business-model", "solution", "structure", 
-        "tasks", "common-tasks", "constraints"
-    ])
+    include_framework_stages: List[str] = field(default_factory=lambda: list(_DEFAULT_FRAMEWORK_STAGES))
     
     # 过滤条件 (project_scope保留用于向后兼容)
     project_scope: Optional[str] = None
@@ -67,7 +442,10 @@ class ContextGenerationConfig:
 
 @dataclass
 class GeneratedContext:
-    """生成的上下文结果"""
+    """生成的上下文结果
+    
+    写文件时按片段逐段写出，不在内存中再拼接一份包含元信息的完整字符串。
+    """
     team_name: str
     mode: ContextMode
     content: str
@@ -76,6 +454,10 @@ class GeneratedContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
     generation_time: str = field(default_factory=lambda: datetime.now().isoformat())
     
+    def iter_content(self) -> Iterator[str]:
+        """按顺序返回内容片段，拼接后即为content"""
+        yield self.content
+    
     def to_markdown(self) -> str:
         """转换为Markdown格式"""
         # 直接返回内容，不包含元信息
@@ -83,54 +465,143 @@ class GeneratedContext:
     
     def to_markdown_with_metadata(self) -> str:
         """转换为包含元信息的完整Markdown格式"""
-        md_content = [
-            f"# {self.team_name.title()} Team Context",
-            f"",
-            f"**Generation Mode:** {self.mode.value}",
-            f"**Generated:** {self.generation_time}",
-            ""
-        ]
-        
-        if self.source_memories:
-            md_content.extend([
-                f"**Memory Sources:** {len(self.source_memories)} items",
-                ""
-            ])
-        
-        if self.framework_stages:
-            md_content.extend([
-                f"**Framework Stages:** {', '.join(self.framework_stages)}",
-                ""
-            ])
-        
-        md_content.extend([
-            "---",
-            "",
-            self.content
-        ])
+        return "".join(self.iter_markdown_with_metadata())
+    
+    def iter_markdown_with_metadata(self) -> Iterator[str]:
+        """按顺序返回包含元信息的Markdown片段，拼接后即为to_markdown_with_metadata的结果"""
+        memory_fragment = (f"**Memory Sources:** {len(self.source_memories)} items\n\n"
+                           if self.source_memories else "")
+        stage_fragment = (f"**Framework Stages:** {', '.join(self.framework_stages)}\n\n"
+                          if self.framework_stages else "")
+        
+        yield (
+            f"# {self.team_name.title()} Team Context\n\n"
+            f"**Generation Mode:** {self.mode.value}\n"
+            f"**Generated:** {self.generation_time}\n\n"
+            f"{memory_fragment}{stage_fragment}---\n\n"
+        )
+        yield from self.iter_content()
         
         if self.metadata:
-            md_content.extend([
-                "",
-                "---",
-                "",
-                "## Generation Metadata",
-                "",
-                f"```json",
-                json.dumps(self.metadata, indent=2, ensure_ascii=False),
-                "```"
-            ])
-        
-        return "\n".join(md_content)
-    
-    def save_to_file(self, output_path: Union[str, Path]) -> Path:
-        """保存到文件"""
+            yield (
+                "\n\n---\n\n## Generation Metadata\n\n```json\n"
+                f"{_dumps_metadata(self.metadata)}\n```"
+            )
+    
+    def save_to_file(self, output_path: Union[str, Path], include_metadata: bool = False) -> Path:
+        """保存到文件
+        
+        Args:
+            include_metadata: 是否写出包含元信息的完整Markdown（同to_markdown_with_metadata）
+        """
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(self.to_markdown(), encoding='utf-8')
+        parent = output_path.parent
+        if not parent.is_dir():
+            parent.mkdir(parents=True, exist_ok=True)
+        
+        chunks = self.iter_markdown_with_metadata() if include_metadata else self.iter_content()
+        
+        # 先写入同目录下的临时文件再原子替换，写入中途失败不会留下半截的目标文件
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            # 逐段写入，避免在内存中再构造一份完整的内容字符串
+            with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         return output_path
 
 
+# 内容片段之间以"\n"连接：正文后接该片段即得到 空行 + "---" + 空行
+_SECTION_SEPARATOR = "\n---\n"
+
+# 团队上下文文件中的元数据段标题及元数据行关键词
+_METADATA_HEADERS = ('## 元数据', '## 最近更新')
+_METADATA_TITLE_RE = re.compile('元数据|最近更新')
+_METADATA_FIELD_RE = re.compile('团队:|生成时间:|上下文类型:|时间:|触发:')
+
+
+@dataclass
+class _MessageFeatures:
+    """一条用户消息在逐条记忆评分时共享的派生数据，每条消息只计算一次"""
+    key: Tuple[str, Tuple[str, ...]]
+    text: str                      # 小写的完整消息
+    keyword_set: frozenset
+    phrases: Tuple[str, ...]       # 相邻关键词组成的短语
+    matcher: KeywordMatcher        # 关键词和短语的多模式匹配器
+    count_hits: Callable[..., Tuple[int, int, int, int]]  # 针对本条消息关键词生成的命中计数函数
+    domain_mask: int               # 消息关键词中领域概念的词表掩码
+    domain_count: int              # 消息关键词中领域概念的个数
+    solution_masks: Tuple[int, ...]  # 消息命中问题词的问题-解决方案对的解决方案掩码
+    tech_mask: int                 # 消息中出现的技术栈词的词表掩码
+    active_concepts: Tuple[int, ...]  # 消息中出现的复合概念在_CONCEPT_MAPPINGS中的下标
+
+
+class _MemoryColumns:
+    """记忆字段的列式存储（SoA），供NumPy批量过滤使用"""
+    
+    def __init__(self, memories: List[MemoryEntry]):
+        self.importance = np.fromiter((m.importance for m in memories), dtype=np.int64, count=len(memories))
+        # 用object数组保留原值，None不会被转成字符串'None'，比较语义与逐条过滤相同
+        self.project = np.array([m.project for m in memories], dtype=object)
+        self.timestamp = np.array([m.timestamp for m in memories], dtype=object)
+        
+        # 标签 -> 拥有该标签的记忆下标
+        self.tag_rows: Dict[str, List[int]] = {}
+        for index, memory in enumerate(memories):
+            for tag in memory.tags:
+                self.tag_rows.setdefault(tag, []).append(index)
+    
+    def filter_mask(self, config: ContextGenerationConfig) -> 'np.ndarray':
+        """按配置计算保留记忆的布尔掩码，语义与逐条过滤一致"""
+        mask = self.importance >= config.memory_importance_threshold
+        
+        if config.project_scope:
+            mask &= self.project == config.project_scope
+        
+        if config.time_range:
+            start_time, end_time = config.time_range
+            mask &= (self.timestamp >= start_time) & (self.timestamp <= end_time)
+        
+        if 'tags' in config.memory_filters:
+            required_tags = config.memory_filters['tags']
+            if isinstance(required_tags, str):
+                required_tags = [required_tags]
+            tag_mask = np.zeros(len(mask), dtype=bool)
+            for tag in required_tags:
+                rows = self.tag_rows.get(tag)
+                if rows:
+                    tag_mask[rows] = True
+            mask &= tag_mask
+        
+        return mask
+    
+    def ranked_indices(self, mask: 'np.ndarray', limit: Optional[int]) -> 'np.ndarray':
+        """按 (重要性, 时间戳) 降序返回掩码保留记忆的下标，同分保持原有顺序，最多limit个"""
+        rows = np.flatnonzero(mask)
+        if rows.size == 0:
+            return rows
+        
+        # 时间戳字符串换成名次后即可取负参与降序排序
+        importance = self.importance[rows]
+        _, timestamp_rank = np.unique(self.timestamp[rows], return_inverse=True)
+        timestamp_rank = timestamp_rank.reshape(-1)
+        
+        # 只需要前limit个时，先用argpartition找到门槛值，丢弃门槛以下的记忆再排序
+        if limit is not None and 0 < limit < rows.size:
+            combined = importance * (int(timestamp_rank.max()) + 1) + timestamp_rank
+            threshold = combined[np.argpartition(-combined, limit - 1)[limit - 1]]
+            keep = np.flatnonzero(combined >= threshold)
+            rows, importance, timestamp_rank = rows[keep], importance[keep], timestamp_rank[keep]
+        
+        # lexsort是稳定排序，与list.sort(reverse=True)对同分元素的处理一致
+        order = np.lexsort((-timestamp_rank, -importance))
+        return rows[order][:limit]
+
+
 class ContextProcessor:
     """上下文处理器"""
     
@@ -142,6 +613,7 @@ class ContextProcessor:
             base_path: 团队数据根目录
             enable_optimized_scoring: 是否启用优化的评分引擎
         """
+        _apply_debug_flag()
         self.base_path = Path(base_path)
         self.directory_manager = DirectoryManager(base_path)
         self.markdown_engine = MarkdownEngine()
@@ -162,17 +634,33 @@ class ContextProcessor:
                 print(f"⚠️ 优化评分引擎初始化失败，使用原始评分: {e}")
                 self.enable_optimized_scoring = False
         
-        # 阶段文件映射
-        self.stage_files = {
-            "overview": "00_overview.md",
-            "requirements": "01_requirements.md",
-            "business-model": "02_business_model.md",
-            "solution": "03_solution.md",
-            "structure": "04_structure.md",
-            "tasks": "05_tasks.md",
-            "common-tasks": "06_common_tasks.md",
-            "constraints": "07_constraints.md"
-        }
+        # 阶段文件映射（模块级只读常量，各实例共享）
+        self.stage_files = _STAGE_FILES
+        
+        # 框架目录在运行期不变，首次使用时扫描一次
+        self._framework_files: Optional[Dict[str, Path]] = None
+        # 框架阶段文件内容同样不变，按阶段缓存（文件不存在时缓存None）
+        self._stage_cache: Dict[str, Optional[str]] = {}
+        # 框架文件不变，按请求的阶段组合缓存 (阶段, 内容) 列表以及仅框架模式预先拼好的正文
+        self._framework_stage_contents_cache: Dict[Tuple[str, ...], Tuple[Tuple[str, str], ...]] = {}
+        self._framework_body_cache: Dict[Tuple[str, ...], Tuple[Optional[str], Tuple[str, ...]]] = {}
+        # 团队/项目上下文文件内容，按路径缓存并以 (mtime, 大小) 判断是否需要重新读取
+        self._context_file_cache: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        # 上下文目录的 {文件名: 路径} 索引，按目录mtime缓存
+        self._markdown_index_cache: Dict[Path, Tuple[int, Dict[str, Path]]] = {}
+        
+        # 最近一条消息的派生数据，供同一轮排序中的所有记忆共享
+        self._last_message_features: Optional[_MessageFeatures] = None
+        
+        # 重复的查询直接复用之前的评分和关键词提取结果
+        self._relevance_score_cache: 'OrderedDict[tuple, float]' = OrderedDict()
+        self._message_keyword_cache: 'OrderedDict[str, Tuple[str, ...]]' = OrderedDict()
+        self._relevance_cache_stats = {'hits': 0, 'misses': 0}
+        
+        # 相同配置、相同消息且团队文件未变化时复用之前生成的上下文
+        self._context_cache: 'OrderedDict[tuple, GeneratedContext]' = OrderedDict()
+        # 本次generate_context已stat过的团队文件 {路径: (mtime, 大小)}，读取上下文文件时直接复用
+        self._file_signatures: Dict[str, Tuple[int, int]] = {}
     
     def generate_context(self, config: ContextGenerationConfig, user_message: str = None) -> GeneratedContext:
         """
@@ -185,21 +673,98 @@ class ContextProcessor:
         Returns:
             生成的上下文
         """
+        _apply_debug_flag()
+        
         # 验证团队存在
         if not self.directory_manager.team_exists(config.team_name):
             raise ValueError(f"Team '{config.team_name}' does not exist")
         
         team_path = self.directory_manager.get_team_path(config.team_name)
         
-        # 根据模式生成上下文
-        if config.mode == ContextMode.MEMORY_ONLY:
-            return self._generate_memory_only_context(config, team_path, user_message)
-        elif config.mode == ContextMode.FRAMEWORK_ONLY:
-            return self._generate_framework_only_context(config, team_path)
-        elif config.mode == ContextMode.HYBRID:
-            return self._generate_hybrid_context(config, team_path, user_message)
-        else:
-            raise ValueError(f"Unsupported context mode: {config.mode}")
+        # 缓存键包含记忆和上下文文件的mtime与大小，文件被修改后自动失效
+        signatures = self._team_files_signatures(team_path, config.project_name)
+        cache_key = self._context_cache_key(config, user_message, signatures)
+        cached = _lru_get(self._context_cache, cache_key)
+        if cached is not None:
+            return self._copy_generated_context(cached)
+        
+        # 生成期间读取上下文文件时复用上面stat得到的 (mtime, 大小)，不再重复stat
+        self._file_signatures = signatures
+        try:
+            # 根据模式生成上下文
+            if config.mode == ContextMode.MEMORY_ONLY:
+                context = self._generate_memory_only_context(config, team_path, user_message)
+            elif config.mode == ContextMode.FRAMEWORK_ONLY:
+                context = self._generate_framework_only_context(config, team_path)
+            elif config.mode == ContextMode.HYBRID:
+                context = self._generate_hybrid_context(config, team_path, user_message)
+            else:
+                raise ValueError(f"Unsupported context mode: {config.mode}")
+        finally:
+            self._file_signatures = {}
+        
+        if not signatures or _mtime_settled(max(mtime for mtime, _ in signatures.values())):
+            _lru_put(self._context_cache, cache_key, context, CONTEXT_CACHE_SIZE)
+        return self._copy_generated_context(context)
+    
+    def _context_cache_key(self, config: ContextGenerationConfig, user_message: Optional[str],
+                           signatures: Dict[str, Tuple[int, int]]) -> tuple:
+        """由生成配置、用户消息和团队文件指纹组成上下文缓存键"""
+        return (
+            config.team_name,
+            config.project_name,
+            config.mode,
+            tuple(config.include_memory_types),
+            config.max_memory_items,
+            config.memory_importance_threshold,
+            config.include_team_memories,
+            tuple(config.include_framework_stages),
+            config.project_scope,
+            tuple(config.time_range) if config.time_range else None,
+            repr(sorted(config.memory_filters.items())),
+            ENABLE_ENHANCED_SCORING,
+            user_message,
+            tuple(sorted(signatures.items())),
+        )
+    
+    @staticmethod
+    def _team_files_signatures(team_path: Path, project_name: Optional[str]) -> Dict[str, Tuple[int, int]]:
+        """收集生成上下文时会读取的记忆和上下文文件的 {路径: (mtime, 大小)}，只做stat不读取内容"""
+        bases = [team_path]
+        if project_name:
+            bases.append(team_path / "projects" / project_name)
+        
+        signatures = {}
+        for base in bases:
+            memory_dir = base / "memory"
+            for path in (memory_dir / "declarative.md", memory_dir / "procedural.md"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                signatures[str(path)] = (st.st_mtime_ns, st.st_size)
+            
+            for directory in (memory_dir / "episodic", base / "context"):
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.name.endswith('.md'):
+                                st = entry.stat()
+                                signatures[entry.path] = (st.st_mtime_ns, st.st_size)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+        
+        return signatures
+    
+    @staticmethod
+    def _copy_generated_context(context: GeneratedContext) -> GeneratedContext:
+        """返回缓存上下文的副本，调用方修改结果不会影响缓存，生成时间取当前时间"""
+        result = copy.copy(context)
+        result.source_memories = list(context.source_memories)
+        result.framework_stages = list(context.framework_stages)
+        result.metadata = dict(context.metadata)
+        result.generation_time = datetime.now().isoformat()
+        return result
     
     def _generate_memory_only_context(self, config: ContextGenerationConfig, team_path: Path, user_message: str = None) -> GeneratedContext:
         """生成仅基于记忆的上下文"""
@@ -218,18 +783,7 @@ class ContextProcessor:
             
             if selected_memories:
                 for memory in selected_memories:
-                    content_sections.extend([
-                        f"### {memory.id}",
-                        f"**Project:** {memory.project}",
-                        f"**Importance:** {'⭐' * memory.importance}",
-                        f"**Tags:** {', '.join(memory.tags)}",
-                        f"**Timestamp:** {memory.timestamp}",
-                        "",
-                        memory.content,
-                        "",
-                        "---",
-                        ""
-                    ])
+                    content_sections.extend(_memory_section(memory, include_timestamp=True))
         
         # 如果没有记忆，生成简洁的内容（不显示"No memories found"）
         if not memories:
@@ -250,43 +804,22 @@ class ContextProcessor:
         """生成仅基于七阶段框架的上下文"""
         content_sections = []
         
-        # 加载概述
-        overview_content = self._load_framework_stage("overview")
-        if overview_content:
-            content_sections.extend([
-                overview_content,
-                "",
-                "---",
-                ""
-            ])
-        
-        # 加载各阶段内容
-        included_stages = []
-        for stage in config.include_framework_stages:
-            stage_content = self._load_framework_stage(stage)
-            if stage_content:
-                included_stages.append(stage)
-                content_sections.extend([
-                    stage_content,
-                    "",
-                    "---",
-                    ""
-                ])
+        # 概述和各阶段内容只取决于阶段组合，拼好的正文跨调用复用
+        framework_body, included_stages = self._framework_body(config.include_framework_stages)
+        if framework_body is not None:
+            content_sections.append(framework_body)
         
         # 尝试加载团队自定义的上下文文件（如果存在）
         team_context_sections = self._load_team_context_files(team_path, config.include_framework_stages)
         if team_context_sections:
-            content_sections.extend([
-                "## Team-Specific Context",
-                "",
-                *team_context_sections
-            ])
+            content_sections.append("## Team-Specific Context\n")
+            content_sections.extend(team_context_sections)
         
         return GeneratedContext(
             team_name=config.team_name,
             mode=config.mode,
             content="\n".join(content_sections),
-            framework_stages=included_stages,
+            framework_stages=list(included_stages),
             metadata={
                 'framework_stages_count': len(included_stages),
                 'requested_stages': config.include_framework_stages
@@ -297,16 +830,10 @@ class ContextProcessor:
         """生成混合模式上下文（记忆+框架）"""
         memories = self._load_team_memories(team_path, config)
         
-        content_sections = []
         used_memory_ids = set()  # 跟踪已使用的记忆，避免重复
         
         # 0. 添加混合模式指导提示
-        content_sections.extend([
-            "先理解记忆的内容，再基于七步框架结合user_message生成具体的结构化提示词",
-            "",
-            "---",
-            ""
-        ])
+        content_sections = ["先理解记忆的内容，再基于七步框架结合user_message生成具体的结构化提示词\n\n---\n"]
         
         # 1. 记忆内容优先放置在前面 - 仅在有相关性时加载
         if memories and user_message:
@@ -316,46 +843,26 @@ class ContextProcessor:
                 # 限制最多5个最相关的记忆
                 top_memories = relevant_memories[:5]
                 for memory in top_memories:
-                    content_sections.extend([
-                        f"#团队记忆",
-                        f"### {memory.id}",
-                        f"**Project:** {memory.project}",
-                        f"**Importance:** {'⭐' * memory.importance}",
-                        f"**Tags:** {', '.join(memory.tags)}",
-                        "",
-                        memory.content,
-                        "",
-                        "---",
-                        ""
-                    ])
+                    content_sections.extend(_memory_section(memory, heading_prefix="#团队记忆\n"))
                     used_memory_ids.add(memory.id)
         
         # 2. 七阶段框架作为主体结构
-        content_sections.extend([
-            "# 七步框架模板内容",
-            "",
-            ""
-        ])
+        content_sections.append("# 七步框架模板内容\n\n")
+        
+        # 项目和团队上下文目录各扫描一次，阶段循环内只做字典查找
+        context_index = self._team_ctx_index(team_path, config.project_name)
         
         included_stages = []
-        for stage in config.include_framework_stages:
-            stage_content = self._load_framework_stage(stage)
-            if stage_content:
-                included_stages.append(stage)
-                content_sections.extend([
-                    stage_content,
-                    ""
-                ])
-                
-                # 3. 加载项目或团队自定义上下文（如果存在且有实际内容）
-                context_content = self._load_context_file(team_path, stage, config)
-                if context_content and context_content.strip():
-                    content_sections.extend([
-                        context_content,
-                        ""
-                    ])
-                
-                content_sections.extend(["---", ""])
+        for stage, stage_content in self._framework_stage_contents(config.include_framework_stages):
+            included_stages.append(stage)
+            content_sections.append(stage_content)
+            
+            # 3. 加载项目或团队自定义上下文（如果存在且有实际内容）
+            context_content = self._load_context_file(team_path, stage, config, context_index)
+            if context_content and context_content.strip():
+                content_sections.extend(("", context_content))
+            
+            content_sections.append(_SECTION_SEPARATOR)
         
         return GeneratedContext(
             team_name=config.team_name,
@@ -373,6 +880,10 @@ class ContextProcessor:
     
     def _load_team_memories(self, team_path: Path, config: ContextGenerationConfig) -> List[MemoryEntry]:
         """加载团队或项目记忆"""
+        # 不需要任何记忆时直接返回，省去扫描目录和解析记忆文件
+        if config.max_memory_items == 0 or not config.include_memory_types:
+            return []
+        
         memories = []
         
         # 根据配置决定加载哪些类型的记忆
@@ -400,26 +911,39 @@ class ContextProcessor:
                 seen_ids.add(memory.id)
                 unique_memories.append(memory)
         
+        # 记忆较多时构建列式存储，过滤在NumPy中批量完成
+        columns = None
+        if HAS_NUMPY and len(unique_memories) >= NUMPY_FILTER_MIN_MEMORIES:
+            columns = _MemoryColumns(unique_memories)
+        
+        if columns is not None:
+            # 过滤、排序和截断都在NumPy中完成
+            mask = columns.filter_mask(config)
+            return [unique_memories[i] for i in columns.ranked_indices(mask, config.max_memory_items)]
+        
         # 应用过滤器
         filtered_memories = self._apply_memory_filters(unique_memories, config)
         
-        # 按重要性和时间排序
-        filtered_memories.sort(
-            key=lambda m: (m.importance, m.timestamp), 
-            reverse=True
-        )
+        # 按重要性和时间排序并限制数量：只需前max_memory_items条时用堆选出，不做完整排序
+        limit = config.max_memory_items
+        if limit is not None and 0 <= limit < len(filtered_memories):
+            return heapq.nlargest(limit, filtered_memories, key=attrgetter('importance', 'timestamp'))
         
-        # 限制数量
-        return filtered_memories[:config.max_memory_items]
+        filtered_memories.sort(key=attrgetter('importance', 'timestamp'), reverse=True)
+        return filtered_memories[:limit]
     
     def _load_memories_from_path(self, base_path: Path, memory_types_to_load: List[MemoryType], source_label: str) -> List[MemoryEntry]:
         """从指定路径加载记忆"""
         memories = []
         
+        # 一次scandir得到memory目录下的所有条目，代替逐个文件exists()
+        memory_dir = base_path / "memory"
+        memory_entries = self._list_dir_names(memory_dir)
+        
         # 加载声明性记忆
         if MemoryType.DECLARATIVE in memory_types_to_load:
-            declarative_path = base_path / "memory" / "declarative.md"
-            if declarative_path.exists():
+            declarative_path = memory_dir / "declarative.md"
+            if "declarative.md" in memory_entries:
                 declarative_memories = self.markdown_engine.load_memories(declarative_path)
                 for memory in declarative_memories:
                     memory.memory_type = "declarative"
@@ -428,8 +952,8 @@ class ContextProcessor:
         
         # 加载程序性记忆
         if MemoryType.PROCEDURAL in memory_types_to_load:
-            procedural_path = base_path / "memory" / "procedural.md"
-            if procedural_path.exists():
+            procedural_path = memory_dir / "procedural.md"
+            if "procedural.md" in memory_entries:
                 # 使用专门的解析器处理procedural.md格式
                 try:
                     from .procedural_memory_parser import load_procedural_memories
@@ -449,13 +973,11 @@ class ContextProcessor:
                         memory_entry.memory_type = "procedural"
                         memories.append(memory_entry)
                     
-                    if ENHANCED_SCORING_DEBUG:
-                        print(f"🔍 使用专门解析器加载procedural.md: {len(memory_items)} 个记忆条目")
+                    logger.debug("🔍 使用专门解析器加载procedural.md: %d 个记忆条目", len(memory_items))
                         
                 except ImportError:
                     # 回退到原始解析器
-                    if ENHANCED_SCORING_DEBUG:
-                        print("⚠️ 专门解析器不可用，使用原始解析器")
+                    logger.debug("⚠️ 专门解析器不可用，使用原始解析器")
                     procedural_memories = self.markdown_engine.load_memories(procedural_path)
                     for memory in procedural_memories:
                         memory.memory_type = "procedural"
@@ -464,10 +986,21 @@ class ContextProcessor:
         
         # 加载情景性记忆
         if MemoryType.EPISODIC in memory_types_to_load:
-            episodic_dir = base_path / "memory" / "episodic"
-            if episodic_dir.exists():
-                for episodic_file in episodic_dir.glob("*.md"):
-                    episodic_memories = self.markdown_engine.load_memories(episodic_file)
+            if "episodic" in memory_entries:
+                # 与Path.glob("*.md")结果和顺序相同
+                episodic_files = [
+                    Path(path) for name, path in self._list_dir_entries(memory_dir / "episodic")
+                    if name.endswith('.md')
+                ]
+                if len(episodic_files) > PARALLEL_EPISODIC_MIN_FILES:
+                    # 文件读取期间会释放GIL，多文件时并行读取以重叠I/O；map保持原有文件顺序
+                    workers = min(PARALLEL_EPISODIC_MAX_WORKERS, len(episodic_files))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(self.markdown_engine.load_memories, episodic_files))
+                else:
+                    results = [self.markdown_engine.load_memories(f) for f in episodic_files]
+                
+                for episodic_memories in results:
                     for memory in episodic_memories:
                         memory.memory_type = "episodic"
                         memory.source = source_label  # 标记记忆来源
@@ -477,34 +1010,26 @@ class ContextProcessor:
     
     def _apply_memory_filters(self, memories: List[MemoryEntry], config: ContextGenerationConfig) -> List[MemoryEntry]:
         """应用记忆过滤器"""
-        filtered = memories
+        threshold = config.memory_importance_threshold
+        project_scope = config.project_scope
+        start_time, end_time = config.time_range if config.time_range else (None, None)
         
-        # 重要性过滤
-        filtered = [m for m in filtered if m.importance >= config.memory_importance_threshold]
-        
-        # 项目范围过滤
-        if config.project_scope:
-            filtered = [m for m in filtered if m.project == config.project_scope]
-        
-        # 时间范围过滤
-        if config.time_range:
-            start_time, end_time = config.time_range
-            filtered = [
-                m for m in filtered 
-                if start_time <= m.timestamp <= end_time
-            ]
-        
-        # 标签过滤
+        # 标签过滤：给出tags时记忆至少要包含其中一个标签（空列表则全部过滤掉）
+        required_tags = None
         if 'tags' in config.memory_filters:
             required_tags = config.memory_filters['tags']
             if isinstance(required_tags, str):
                 required_tags = [required_tags]
-            filtered = [
-                m for m in filtered 
-                if any(tag in m.tags for tag in required_tags)
-            ]
-        
-        return filtered
+            required_tags = set(required_tags)
+        
+        # 所有条件在一次遍历中判断，不生成中间列表
+        return [
+            m for m in memories
+            if m.importance >= threshold
+            and (not project_scope or m.project == project_scope)
+            and (start_time is None or start_time <= m.timestamp <= end_time)
+            and (required_tags is None or not required_tags.isdisjoint(m.tags))
+        ]
     
     def _group_memories_by_type(self, memories: List[MemoryEntry]) -> Dict[str, List[MemoryEntry]]:
         """按类型分组记忆"""
@@ -514,35 +1039,136 @@ class ContextProcessor:
             "episodic": []
         }
         
+        declarative = groups['declarative']
         for memory in memories:
-            memory_type = getattr(memory, 'memory_type', 'declarative')
-            if memory_type in groups:
-                groups[memory_type].append(memory)
-            else:
-                groups['declarative'].append(memory)  # 默认归类为声明性记忆
+            # 未知类型默认归类为声明性记忆；MemoryEntry自带memory_type默认值，无需getattr兜底
+            groups.get(memory.memory_type, declarative).append(memory)
         
         return groups
     
     def _load_framework_stage(self, stage: str) -> Optional[str]:
-        """加载框架阶段内容"""
+        """加载框架阶段内容（首次读取后缓存）"""
+        if stage in self._stage_cache:
+            return self._stage_cache[stage]
+        
         if stage not in self.stage_files:
             return None
         
-        stage_file = self.framework_path / self.stage_files[stage]
-        if stage_file.exists():
-            return stage_file.read_text(encoding='utf-8')
-        return None
+        if self._framework_files is None:
+            self._framework_files = self._scan_markdown_files(self.framework_path)
+        
+        content = None
+        stage_file = self._framework_files.get(self.stage_files[stage])
+        if stage_file is not None:
+            content = self._read_utf8_file(stage_file)
+        self._stage_cache[stage] = content
+        return content
+    
+    def _framework_stage_contents(self, stages: List[str]) -> Tuple[Tuple[str, str], ...]:
+        """返回请求阶段中有框架内容的 (阶段, 内容)，保持请求顺序，按阶段组合缓存"""
+        key = tuple(stages)
+        contents = self._framework_stage_contents_cache.get(key)
+        if contents is None:
+            contents = tuple(
+                (stage, stage_content) for stage in key
+                for stage_content in (self._load_framework_stage(stage),) if stage_content
+            )
+            self._framework_stage_contents_cache[key] = contents
+        return contents
+    
+    def _framework_body(self, stages: List[str]) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        仅框架模式的正文：概述和各阶段内容，每段后接分隔符
+        
+        Returns:
+            (拼接好的正文，没有任何内容时为None, 实际包含的阶段)
+        """
+        key = tuple(stages)
+        cached = self._framework_body_cache.get(key)
+        if cached is None:
+            parts = []
+            overview_content = self._load_framework_stage("overview")
+            if overview_content:
+                parts.extend((overview_content, _SECTION_SEPARATOR))
+            
+            stage_contents = self._framework_stage_contents(key)
+            for _, stage_content in stage_contents:
+                parts.extend((stage_content, _SECTION_SEPARATOR))
+            
+            # 与逐段放入content_sections再以"\n"连接的结果相同
+            cached = ("\n".join(parts) if parts else None, tuple(stage for stage, _ in stage_contents))
+            self._framework_body_cache[key] = cached
+        return cached
+    
+    @staticmethod
+    def _list_dir_entries(directory: Path) -> List[Tuple[str, str]]:
+        """单次os.scandir列出目录下的 (名称, 路径)，目录不存在时返回空列表"""
+        try:
+            with os.scandir(directory) as entries:
+                return [(entry.name, entry.path) for entry in entries]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+    
+    @staticmethod
+    def _list_dir_names(directory: Path) -> frozenset:
+        """目录下所有条目名称的集合，目录不存在时为空集"""
+        return frozenset(name for name, _ in ContextProcessor._list_dir_entries(directory))
+    
+    @staticmethod
+    def _scan_markdown_files(directory: Path) -> Dict[str, Path]:
+        """单次os.scandir扫描目录，返回 {文件名: 路径}，目录不存在时返回空字典"""
+        try:
+            with os.scandir(directory) as entries:
+                return {
+                    entry.name: Path(entry.path)
+                    for entry in entries
+                    if entry.name.endswith('.md') and entry.is_file()
+                }
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+    
+    def _markdown_index(self, directory: Path) -> Dict[str, Path]:
+        """带缓存的_scan_markdown_files：目录内文件增删会更新目录mtime，mtime不变时复用上次的索引"""
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        
+        cached = self._markdown_index_cache.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        index = self._scan_markdown_files(directory)
+        if _mtime_settled(mtime_ns):
+            self._markdown_index_cache[directory] = (mtime_ns, index)
+        return index
     
-    def _load_context_file(self, team_path: Path, stage: str, config: ContextGenerationConfig) -> Optional[str]:
-        """加载项目或团队特定的上下文文件，项目优先"""
+    def _team_ctx_index(self, team_path: Path, project_name: Optional[str]) -> Tuple[Dict[str, Path], Dict[str, Path]]:
+        """扫描项目和团队的上下文目录，返回 (项目上下文文件, 团队上下文文件) 两个索引"""
+        project_index = {}
+        if project_name:
+            project_index = self._markdown_index(team_path / "projects" / project_name / "context")
+        team_index = self._markdown_index(team_path / "context")
+        return project_index, team_index
+    
+    def _load_context_file(self, team_path: Path, stage: str, config: ContextGenerationConfig,
+                           context_index: Optional[Tuple[Dict[str, Path], Dict[str, Path]]] = None) -> Optional[str]:
+        """加载项目或团队特定的上下文文件，项目优先
+        
+        Args:
+            context_index: _team_ctx_index的结果，批量加载多个阶段时传入以避免重复扫描目录
+        """
+        if context_index is None:
+            context_index = self._team_ctx_index(team_path, config.project_name)
+        project_index, team_index = context_index
+        
         content_parts = []
         
         # 如果指定了项目，优先加载项目上下文
         if config.project_name:
-            project_path = team_path / "projects" / config.project_name
-            project_context_file = project_path / "context" / f"{stage}.md"
-            if project_context_file.exists():
-                project_content = project_context_file.read_text(encoding='utf-8')
+            project_context_file = project_index.get(f"{stage}.md")
+            project_content = self._read_context_text(project_context_file) if project_context_file else None
+            if project_content:
                 filtered_content = self._filter_team_context_content(project_content)
                 if filtered_content and filtered_content.strip():
                     content_parts.append(f"## 项目上下文 ({config.project_name})")
@@ -550,9 +1176,9 @@ class ContextProcessor:
         
         # 如果配置了包含团队上下文，或者没有指定项目，加载团队上下文
         if config.include_team_memories or not config.project_name:
-            team_context_file = team_path / "context" / f"{stage}.md"
-            if team_context_file.exists():
-                team_content = team_context_file.read_text(encoding='utf-8')
+            team_context_file = team_index.get(f"{stage}.md")
+            team_content = self._read_context_text(team_context_file) if team_context_file else None
+            if team_content:
                 filtered_content = self._filter_team_context_content(team_content)
                 if filtered_content and filtered_content.strip():
                     if content_parts:  # 如果已有项目上下文，添加分隔
@@ -563,41 +1189,75 @@ class ContextProcessor:
     
     def _load_team_context_file(self, team_path: Path, stage: str) -> Optional[str]:
         """加载团队特定的上下文文件，过滤掉元数据部分（向后兼容方法）"""
-        context_file = team_path / "context" / f"{stage}.md"
-        if context_file.exists():
-            content = context_file.read_text(encoding='utf-8')
+        content = self._read_context_text(team_path / "context" / f"{stage}.md")
+        if content:
             return self._filter_team_context_content(content)
         return None
     
+    def _read_context_text(self, path: Path) -> Optional[str]:
+        """读取上下文文件；文件不存在或为空（占位文件）时只做一次stat，不读取也不解码
+        
+        内容按 (mtime, 大小) 缓存，文件未变化时直接返回上次读取的文本；
+        generate_context已为缓存键stat过的文件直接使用其结果。
+        """
+        signature = self._file_signatures.get(str(path))
+        if signature is None:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return None
+            signature = (st.st_mtime_ns, st.st_size)
+        if signature[1] == 0:
+            return None
+        
+        cached = self._context_file_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        text = self._read_utf8_file(path)
+        if _mtime_settled(signature[0]):
+            self._context_file_cache[path] = (signature, text)
+        return text
+    
+    @staticmethod
+    def _read_utf8_file(path: Path) -> str:
+        """以二进制一次读入整个文件并解码为UTF-8文本，换行符与read_text一样统一为\\n"""
+        with open(path, 'rb', buffering=1 << 16) as f:
+            text = f.read().decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
     def _filter_team_context_content(self, content: str) -> str:
         """过滤团队上下文内容，去掉元数据部分，只保留实际内容"""
-        lines = content.split('\n')
         filtered_lines = []
         skip_metadata = False
         
-        for line in lines:
+        for line in content.split('\n'):
+            stripped = line.strip()
+            
             # 跳过元数据相关的部分
-            if line.strip().startswith('## 元数据') or line.strip().startswith('## 最近更新'):
+            if stripped.startswith(_METADATA_HEADERS):
                 skip_metadata = True
                 continue
             
-            # 如果遇到新的二级标题，且不是元数据相关，停止跳过
-            if line.strip().startswith('## ') and not any(keyword in line for keyword in ['元数据', '最近更新']):
-                skip_metadata = False
-            
-            # 如果遇到三级标题，通常表示实际内容开始
-            if line.strip().startswith('### '):
+            # 遇到三级标题（通常表示实际内容开始）或非元数据的二级标题，停止跳过
+            if stripped.startswith('### ') or (stripped.startswith('## ') and not _METADATA_TITLE_RE.search(line)):
                 skip_metadata = False
             
             # 如果不在跳过状态，且不是元数据行，则保留
-            if not skip_metadata and not (line.strip().startswith('- **') and any(keyword in line for keyword in ['团队:', '生成时间:', '上下文类型:', '时间:', '触发:'])):
+            if not skip_metadata and not (stripped.startswith('- **') and _METADATA_FIELD_RE.search(line)):
                 filtered_lines.append(line)
         
         # 清理开头的空行和标题
-        while filtered_lines and (not filtered_lines[0].strip() or filtered_lines[0].strip().startswith('#')):
-            filtered_lines.pop(0)
-        
-        return '\n'.join(filtered_lines).strip()
+        start = 0
+        while start < len(filtered_lines):
+            stripped = filtered_lines[start].strip()
+            if stripped and not stripped.startswith('#'):
+                break
+            start += 1
+        
+        return '\n'.join(filtered_lines[start:]).strip()
     
     def _load_team_context_files(self, team_path: Path, stages: List[str]) -> List[str]:
         """加载团队所有上下文文件"""
@@ -613,51 +1273,16 @@ class ContextProcessor:
                 ])
         return sections
     
-    def _find_memories_for_stage(self, memories: List[MemoryEntry], stage: str) -> List[MemoryEntry]:
-        """为特定阶段找到相关记忆"""
-        # 定义每个阶段的关键词
-        stage_keywords = {
-            "requirements": ["需求", "requirement", "需要", "目标", "goal", "objective"],
-            "business-model": ["业务", "business", "模型", "model", "流程", "process"],
-            "solution": ["解决方案", "solution", "方案", "approach", "策略", "strategy"],
-            "structure": ["架构", "architecture", "结构", "structure", "设计", "design"],
-            "tasks": ["任务", "task", "工作", "work", "实施", "implementation"],
-            "common-tasks": ["通用", "common", "标准", "standard", "模板", "template"],
-            "constraints": ["约束", "constraint", "限制", "limitation", "规则", "rule"]
-        }
-        
-        keywords = stage_keywords.get(stage, [])
-        if not keywords:
-            return []
-        
-        relevant_memories = []
-        for memory in memories:
-            # 检查标签
-            tag_match = any(
-                any(keyword.lower() in tag.lower() for keyword in keywords)
-                for tag in memory.tags
-            )
-            
-            # 检查内容
-            content_match = any(
-                keyword.lower() in memory.content.lower() 
-                for keyword in keywords
-            )
-            
-            if tag_match or content_match:
-                relevant_memories.append(memory)
-        
-        # 按重要性排序
-        relevant_memories.sort(key=lambda m: m.importance, reverse=True)
-        return relevant_memories
-    
     def _find_relevant_memories_by_message(self, memories: List[MemoryEntry], user_message: str) -> List[MemoryEntry]:
         """根据用户消息智能选择相关记忆（优化版本）"""
         if not user_message or not memories:
             return []
         
+        # 消息只转换一次小写，后续提取关键词和评分都复用
+        msg_lower = user_message.lower()
+        
         # 提取用户消息中的关键词
-        message_keywords = self._extract_keywords_from_message(user_message.lower())
+        message_keywords = self._extract_keywords_from_message(msg_lower)
         
         # 如果没有提取到关键词，说明消息与技术内容无关，不加载任何记忆
         if not message_keywords:
@@ -668,7 +1293,7 @@ class ContextProcessor:
             try:
                 # 批量计算评分
                 batch_results = self._optimized_scoring_engine.batch_calculate_scores(
-                    user_message.lower(), 
+                    msg_lower, 
                     memories, 
                     max_workers=4
                 )
@@ -682,21 +1307,20 @@ class ContextProcessor:
                         if memory:
                             scored_memories.append((memory, score))
                 
-                if ENHANCED_SCORING_DEBUG and scored_memories:
-                    print(f"🚀 批量评分完成: {len(scored_memories)}/{len(memories)} 个记忆符合阈值")
-                    # 显示性能统计
+                if scored_memories and logger.isEnabledFor(logging.DEBUG):
+                    # 显示性能统计（仅在调试级别开启时才计算）
                     stats = self._optimized_scoring_engine.get_performance_stats()
-                    print(f"   缓存命中率: {stats['cache_hit_rate']}")
-                    print(f"   平均响应时间: {stats['avg_response_time']:.3f}s")
+                    logger.debug("🚀 批量评分完成: %d/%d 个记忆符合阈值", len(scored_memories), len(memories))
+                    logger.debug("   缓存命中率: %s", stats['cache_hit_rate'])
+                    logger.debug("   平均响应时间: %.3fs", stats['avg_response_time'])
                 
             except Exception as e:
-                if ENHANCED_SCORING_DEBUG:
-                    print(f"⚠️ 批量评分失败，使用单独评分: {e}")
+                logger.debug("⚠️ 批量评分失败，使用单独评分: %s", e)
                 # 回退到单独评分
-                scored_memories = self._calculate_individual_scores(memories, message_keywords, user_message.lower())
+                scored_memories = self._calculate_individual_scores(memories, message_keywords, msg_lower)
         else:
             # 使用单独评分
-            scored_memories = self._calculate_individual_scores(memories, message_keywords, user_message.lower())
+            scored_memories = self._calculate_individual_scores(memories, message_keywords, msg_lower)
         
         # 如果没有足够相关的记忆，返回空列表
         if not scored_memories:
@@ -709,6 +1333,10 @@ class ContextProcessor:
     
     def _calculate_individual_scores(self, memories: List[MemoryEntry], message_keywords: List[str], user_message: str) -> List[Tuple[MemoryEntry, float]]:
         """单独计算每个记忆的评分（原始方法）"""
+        if not ENABLE_ENHANCED_SCORING:
+            # 直接使用原始算法时先批量评分，下面逐条取分时命中缓存
+            self.score_memories_batch(memories, message_keywords, user_message)
+        
         scored_memories = []
         for memory in memories:
             score = self._calculate_memory_relevance_score(memory, message_keywords, user_message)
@@ -719,65 +1347,44 @@ class ContextProcessor:
         return scored_memories
     
     def _extract_keywords_from_message(self, message: str) -> List[str]:
-        """从用户消息中提取关键词"""
-        import re
-        
-        # 过滤停用词 - 扩展列表，过滤更多无关词汇
-        stop_words = {
-            # 英文停用词
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-            'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his',
-            'get', 'make', 'go', 'come', 'know', 'think', 'see', 'want', 'use', 'find', 'give', 'tell', 'work',
-            'call', 'try', 'ask', 'need', 'feel', 'become', 'leave', 'put', 'mean', 'keep', 'let', 'begin',
-            # 中文停用词
-            '我', '你', '他', '她', '它', '我们', '你们', '他们', '的', '了', '在', '是', '有', '这', '那',
-            '一个', '请', '帮', '我要', '需要', '希望', '可以', '如何', '怎么', '什么', '为什么', '因为',
-            '所以', '但是', '然后', '现在', '已经', '还是', '就是', '都是', '不是', '没有', '也是', '或者',
-            '其他', '其它', '一些', '很多', '非常', '特别', '比较', '觉得', '应该', '可能', '一直', '总是',
-            '从来', '从不', '永远', '马上', '立即', '现在', '以前', '以后', '今天', '明天', '昨天'
-        }
+        """从用户消息中提取关键词（按消息缓存结果）
         
-        keywords = []
+        Args:
+            message: 已转换为小写的用户消息
+        """
+        keywords = _lru_get(self._message_keyword_cache, message)
+        if keywords is None:
+            keywords = tuple(self._compute_message_keywords(message))
+            _lru_put(self._message_keyword_cache, message, keywords)
+        return list(keywords)
+    
+    def _compute_message_keywords(self, message: str) -> List[str]:
+        """从已转换为小写的用户消息中提取关键词"""
+        # dict按插入顺序去重，保持关键词在消息中的出现顺序
+        keywords: Dict[str, None] = {}
         
         # 处理英文词汇（按空格分割）
-        english_words = re.findall(r'[a-zA-Z]+', message)
+        english_words = _ENGLISH_WORD_RE.findall(message)
         for word in english_words:
-            word_lower = word.lower()
             # 提高英文单词的最小长度要求，避免提取无意义的短词
-            if len(word) >= 3 and word_lower not in stop_words:
-                keywords.append(word_lower)
-        
-        # 处理中文关键词（使用简单的规则识别）
-        chinese_text = re.sub(r'[^\u4e00-\u9fa5]', '', message)
-        
-        # 识别常见的技术术语和概念 - 更精准的匹配
-        tech_patterns = [
-            r'工作流', r'workflow', r'API', r'api', r'接口', r'数据库', r'database', 
-            r'认证', r'authentication', r'权限', r'authorization', r'管理', r'management',
-            r'服务', r'service', r'查询', r'query', r'分页', r'pagination', 
-            r'架构', r'architecture', r'实现', r'implementation', r'配置', r'configuration',
-            r'框架', r'framework', r'模型', r'model', r'业务', r'business', 
-            r'流程', r'process', r'功能', r'feature', r'模块', r'module', r'组件', r'component',
-            r'Rule', r'rule', r'Solution', r'solution', r'Prompt', r'prompt'
-        ]
+            if len(word) >= 3 and word not in _STOP_WORDS:
+                keywords[word] = None
         
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                if match.lower() not in [kw.lower() for kw in keywords]:
-                    keywords.append(match.lower())
+        # 识别常见的技术术语和概念 - 单次扫描找出所有出现的术语
+        for _, match in _TECH_MATCHER.iter(message):
+            keywords[match] = None
         
         # 如果没有找到关键词，使用简单的字符切分作为备选
-        if not keywords and chinese_text:
-            # 简单的中文双字词提取
-            for i in range(len(chinese_text) - 1):
-                two_char = chinese_text[i:i+2]
-                if two_char not in stop_words:
-                    keywords.append(two_char)
+        if not keywords:
+            # 处理中文关键词（使用简单的规则识别）
+            chinese_text = _NON_CHINESE_RE.sub('', message)
+            
+            # 简单的中文双字词提取：相邻字符两两拼接、剔除停用词，dict按出现顺序去重
+            keywords = dict.fromkeys(
+                filterfalse(_STOP_WORDS.__contains__, map(add, chinese_text, chinese_text[1:]))
+            )
         
-        return list(set(keywords))  # 去重
+        return list(keywords)
     
     def _calculate_memory_relevance_score(self, memory: MemoryEntry, message_keywords: List[str], full_message: str) -> float:
         """计算记忆与用户消息的相关性分数（集成优化评分算法）"""
@@ -787,201 +1394,265 @@ class ContextProcessor:
             try:
                 score, details = self._optimized_scoring_engine.calculate_memory_score(full_message, memory)
                 
-                if ENHANCED_SCORING_DEBUG:
-                    print(f"🚀 优化评分 - {memory.id}: {score:.2f}")
-                    print(f"   匹配关键词: {', '.join(details.get('matched_keywords', [])[:5])}")
-                    print(f"   关键优势: {', '.join(details.get('key_strengths', [])[:3])}")
-                    print(f"   缓存状态: {'命中' if details.get('cached') else '未命中'}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🚀 优化评分 - %s: %.2f", memory.id, score)
+                    logger.debug("   匹配关键词: %s", ', '.join(details.get('matched_keywords', [])[:5]))
+                    logger.debug("   关键优势: %s", ', '.join(details.get('key_strengths', [])[:3]))
+                    logger.debug("   缓存状态: %s", '命中' if details.get('cached') else '未命中')
                 
                 return score
                 
             except Exception as e:
-                if ENHANCED_SCORING_DEBUG:
-                    print(f"⚠️ 优化评分引擎出错，回退到增强算法: {e}")
+                logger.debug("⚠️ 优化评分引擎出错，回退到增强算法: %s", e)
+        
+        # 增强/原始评分只取决于消息和记忆本身，相同输入直接复用缓存结果
+        cache_key = self._relevance_cache_key(memory, message_keywords, full_message)
+        score = _lru_get(self._relevance_score_cache, cache_key)
+        if score is not None:
+            self._relevance_cache_stats['hits'] += 1
+            return score
+        
+        self._relevance_cache_stats['misses'] += 1
+        score = self._compute_memory_relevance_score(memory, message_keywords, full_message)
+        _lru_put(self._relevance_score_cache, cache_key, score)
+        return score
+    
+    @staticmethod
+    def _relevance_cache_key(memory: MemoryEntry, message_keywords: List[str], full_message: str) -> tuple:
+        """相关性评分缓存键：消息、关键词、评分模式以及会影响分数的记忆字段"""
+        content_hash = getattr(memory, '_content_hash', None)
+        if content_hash is None:
+            content_hash = memory._content_hash = hash(memory.content)
+        return (full_message, tuple(message_keywords), ENABLE_ENHANCED_SCORING,
+                memory.id, memory.importance, memory.project, tuple(memory.tags), content_hash)
+    
+    def _compute_memory_relevance_score(self, memory: MemoryEntry, message_keywords: List[str], full_message: str) -> float:
+        """使用增强评分引擎（不可用时回退到原始算法）计算相关性分数"""
         
         # 回退到增强评分算法
         if ENABLE_ENHANCED_SCORING:
-            try:
-                # 尝试使用增强的评分引擎
-                from src.scoring_self_evolution import SelfLearningMemoryScoringEngine, MemoryItem
-                
-                # 将MemoryEntry转换为MemoryItem
-                memory_item = MemoryItem(
-                    id=memory.id,
-                    title=getattr(memory, 'title', memory.id),
-                    content=memory.content,
-                    tags=memory.tags,
-                    project=memory.project,
-                    importance=memory.importance
-                )
-                
-                # 创建增强评分引擎
-                scoring_engine = SelfLearningMemoryScoringEngine()
-                
-                # 使用增强评分算法
-                results = scoring_engine.score_memory_items(full_message, [memory_item])
-                
-                if results:
-                    enhanced_score = results[0].total_score
+            engine_classes = _load_enhanced_scoring_classes()
+            if engine_classes is None:
+                # 如果增强评分引擎不可用，回退到原始算法
+                logger.debug("⚠️ 增强评分引擎不可用，使用原始算法")
+            else:
+                SelfLearningMemoryScoringEngine, MemoryItem = engine_classes
+                try:
+                    # 将MemoryEntry转换为MemoryItem
+                    memory_item = MemoryItem(
+                        id=memory.id,
+                        title=getattr(memory, 'title', memory.id),
+                        content=memory.content,
+                        tags=memory.tags,
+                        project=memory.project,
+                        importance=memory.importance
+                    )
                     
-                    if ENHANCED_SCORING_DEBUG:
-                        print(f"🔍 增强评分 - {memory.id}: {enhanced_score:.2f}")
-                        print(f"   匹配关键词: {', '.join(results[0].matched_keywords[:5])}")
-                        print(f"   关键优势: {', '.join(results[0].key_strengths[:3])}")
+                    # 创建增强评分引擎：引擎评分时会自学习并修改自身状态，
+                    # 每次评分使用新实例以保证同一输入得到相同分数（构建开销与一次评分相当）
+                    scoring_engine = SelfLearningMemoryScoringEngine()
                     
-                    # 返回增强评分结果
-                    return enhanced_score
+                    # 使用增强评分算法
+                    results = scoring_engine.score_memory_items(full_message, [memory_item])
                     
-            except ImportError:
-                # 如果增强评分引擎不可用，回退到原始算法
-                if ENHANCED_SCORING_DEBUG:
-                    print("⚠️ 增强评分引擎不可用，使用原始算法")
-            except Exception as e:
-                # 如果增强评分出现错误，回退到原始算法
-                if ENHANCED_SCORING_DEBUG:
-                    print(f"⚠️ 增强评分算法出错，回退到原始算法: {e}")
+                    if results:
+                        enhanced_score = results[0].total_score
+                        
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("🔍 增强评分 - %s: %.2f", memory.id, enhanced_score)
+                            logger.debug("   匹配关键词: %s", ', '.join(results[0].matched_keywords[:5]))
+                            logger.debug("   关键优势: %s", ', '.join(results[0].key_strengths[:3]))
+                        
+                        # 返回增强评分结果
+                        return enhanced_score
+                        
+                except Exception as e:
+                    # 如果增强评分出现错误，回退到原始算法
+                    logger.debug("⚠️ 增强评分算法出错，回退到原始算法: %s", e)
         
         # 原始评分算法（作为回退方案）
-        score = 0.0
-        
-        # 1. 标签匹配 (权重: 3.0)
-        for tag in memory.tags:
-            tag_lower = tag.lower()
-            for keyword in message_keywords:
-                if keyword in tag_lower or tag_lower in keyword:
-                    score += 3.0
-        
-        # 2. 内容关键词匹配 (权重: 2.0)
-        memory_content_lower = memory.content.lower()
-        for keyword in message_keywords:
-            if keyword in memory_content_lower:
-                score += 2.0
-        
-        # 3. 项目名匹配 (权重: 1.5)
-        if memory.project and memory.project.lower() != 'general':
-            project_lower = memory.project.lower()
-            for keyword in message_keywords:
-                if keyword in project_lower or project_lower in keyword:
-                    score += 1.5
-        
-        # 4. 完整短语匹配 (权重: 4.0)
-        # 寻找用户消息中的2-3词组合是否在记忆内容中出现
-        for i in range(len(message_keywords) - 1):
-            phrase = " ".join(message_keywords[i:i+2])
-            if phrase in memory_content_lower:
-                score += 4.0
+        features = self._message_features(full_message, message_keywords)
+        tag_hits, content_hits, project_hits, phrase_hits = self._count_keyword_hits(memory, message_keywords, features)
+        score = tag_hits * 3.0 + content_hits * 2.0 + project_hits * 1.5 + phrase_hits * 4.0
         
         # 5. 语义相关性匹配 (权重: 1.5倍，因为语义比字面匹配更重要)
         semantic_score = self._calculate_semantic_relevance(memory, message_keywords, full_message)
         score += semantic_score * 1.5  # 提高语义相关性的权重
         
-        # 6. 重要性加权
-        score *= (memory.importance / 3.0)  # 重要性归一化到相对权重
+        # 6. 重要性加权（重要性为3时权重为1，无需相乘）
+        importance_weight = _importance_weight(memory)
+        if importance_weight != 1.0:
+            score *= importance_weight
         
         return score
     
+    def score_memories_batch(self, memories: List[MemoryEntry], message_keywords: List[str], full_message: str) -> List[float]:
+        """
+        用原始评分算法批量计算一组记忆的相关性分数
+        
+        每条记忆的文本只扫描一次，得到标签/内容/项目/短语命中次数后按权重向量一次性计算总分；
+        已在相关性缓存中的记忆直接取缓存结果，只为其余记忆计算。
+        结果写入相关性缓存，后续逐条调用_calculate_memory_relevance_score直接命中。
+        
+        Args:
+            memories: 记忆列表
+            message_keywords: 消息关键词
+            full_message: 小写的用户消息
+            
+        Returns:
+            与memories一一对应的分数列表
+        """
+        features = self._message_features(full_message, message_keywords)
+        
+        cache_keys = [self._relevance_cache_key(memory, message_keywords, full_message) for memory in memories]
+        scores: List[Optional[float]] = []
+        pending = []
+        for index, cache_key in enumerate(cache_keys):
+            score = _lru_get(self._relevance_score_cache, cache_key)
+            if score is None:
+                pending.append(index)
+            scores.append(score)
+        if not pending:
+            return scores
+        
+        pending_memories = [memories[index] for index in pending]
+        hit_counts = [self._count_keyword_hits(memory, message_keywords, features) for memory in pending_memories]
+        semantic_scores = [self._calculate_semantic_relevance(memory, message_keywords, full_message)
+                           for memory in pending_memories]
+        importance_weights = [_importance_weight(memory) for memory in pending_memories]
+        
+        if HAS_NUMPY:
+            # 命中次数矩阵 [N, 4] 与权重向量 [3.0, 2.0, 1.5, 4.0] 相乘
+            computed = np.array(hit_counts, dtype=np.float64) @ np.array([3.0, 2.0, 1.5, 4.0])
+            computed += np.array(semantic_scores) * 1.5
+            computed *= np.array(importance_weights, dtype=np.float64)
+            computed = computed.tolist()
+        else:
+            computed = [
+                (tag_hits * 3.0 + content_hits * 2.0 + project_hits * 1.5 + phrase_hits * 4.0
+                 + semantic_score * 1.5) * importance_weight
+                for (tag_hits, content_hits, project_hits, phrase_hits), semantic_score, importance_weight
+                in zip(hit_counts, semantic_scores, importance_weights)
+            ]
+        
+        for index, score in zip(pending, computed):
+            scores[index] = score
+            _lru_put(self._relevance_score_cache, cache_keys[index], score)
+        return scores
+    
+    def _count_keyword_hits(self, memory: MemoryEntry, message_keywords: List[str],
+                            features: '_MessageFeatures') -> Tuple[int, int, int, int]:
+        """统计记忆的标签、内容、项目名、短语命中次数（对应原始评分算法的1-4项）"""
+        _ensure_lowercase(memory)
+        tags_lc = memory._tags_lc
+        
+        # 拼接文本只扫描一次，按命中位置归入对应分段
+        section_starts = memory._section_starts
+        section_hits = [set() for _ in section_starts]
+        for end_idx, keyword in features.matcher.iter(memory._sections_lc):
+            section_hits[bisect_right(section_starts, end_idx) - 1].add(keyword)
+        
+        # 按关键词逐项计数由针对当前消息生成的专用函数完成
+        check_project = bool(memory.project) and memory._project_lc != 'general'
+        return features.count_hits(tags_lc, section_hits, memory._project_lc, check_project)
+    
     def _calculate_semantic_relevance(self, memory: MemoryEntry, message_keywords: List[str], full_message: str) -> float:
         """计算语义相关性得分 - 基于通用语义匹配原则"""
         semantic_score = 0.0
-        full_message_lower = full_message.lower()
-        memory_content_lower = memory.content.lower()
-        memory_tags_lower = ' '.join(memory.tags).lower()
-        memory_text = memory_content_lower + ' ' + memory_tags_lower
+        features = self._message_features(full_message, message_keywords)
+        memory_text = _ensure_lowercase(memory)._text_lc
+        
+        memory_mask = _semantic_mask(memory)
         
         # 1. 领域概念密度评分 (0-10分)
         # 计算用户消息和记忆内容中共同技术概念的密度
-        domain_keywords = ['api', 'workflow', 'solution', 'rule', 'step', 'validation', 'model', 
-                          'architecture', 'design', 'service', 'id', 'reference', 'create', 'update']
-        
-        user_domain_concepts = [kw for kw in message_keywords if kw in domain_keywords]
-        memory_domain_matches = sum(1 for concept in user_domain_concepts if concept in memory_text)
-        
-        if user_domain_concepts:
-            domain_density = (memory_domain_matches / len(user_domain_concepts)) * 10
+        if features.domain_count:
+            memory_domain_matches = _popcount(features.domain_mask & memory_mask)
+            domain_density = (memory_domain_matches / features.domain_count) * 10
             semantic_score += domain_density
         
         # 2. 问题-解决方案匹配度 (0-15分)
         # 检测用户消息中的问题类型，评估记忆是否提供相应解决方案
-        problem_solution_pairs = [
-            (['enhance', 'improve', 'add', 'support'], ['design', 'architecture', 'implementation', 'approach']),
-            (['validate', 'check', 'ensure'], ['validation', 'verification', 'logic', 'mechanism']),
-            (['reference', 'link', 'connect'], ['relationship', 'mapping', 'association', 'routing']),
-            (['create', 'build', 'generate'], ['creation', 'construction', 'generation', 'workflow']),
-            (['model', 'structure', 'entity'], ['class', 'inheritance', 'hierarchy', 'design'])
-        ]
-        
-        for problem_words, solution_words in problem_solution_pairs:
-            has_problem = any(word in message_keywords for word in problem_words)
-            has_solution = any(word in memory_text for word in solution_words)
-            if has_problem and has_solution:
+        for solution_mask in features.solution_masks:
+            if solution_mask & memory_mask:
                 semantic_score += 3.0  # 每个问题-解决方案匹配得3分
         
         # 3. 复合概念匹配 (0-20分)
-        # 识别用户消息中的复合概念，并在记忆中寻找语义相关的解决方案
-        import re
-        
-        # 提取用户消息中的关键短语
-        user_phrases = re.findall(r'[a-z]+(?:\s+[a-z]+){1,2}', full_message_lower)
-        
-        # 定义复合概念的语义映射
-        concept_mappings = [
-            # Solution as step 核心概念
-            (['solution as step', 'solution.*step', 'setting solution.*step'], 
-             ['orderedsteps', 'step.*solution', 'solution.*workflow', 'list.*string']),
-            
-            # Reference and ID concepts  
-            (['solution reference', 'solution.*id', 'reference.*solution'], 
-             ['id.*prefix', 'prefix.*identification', 's_.*uuid', 'service.*routing']),
-            
-            # Validation concepts
-            (['validate.*solution', 'ensure.*valid', 'validate.*exist'],
-             ['validation.*logic', 'exist.*rule', 'prompt.*exist', 'routing.*service']),
-            
-            # Workflow creation concepts
-            (['workflow creation', 'creating workflow', 'workflow.*api'],
-             ['create.*workflow', 'workflow.*design', 'api.*design', 'controller.*service']),
-            
-            # Data model concepts
-            (['data model', 'dto.*entit', 'model.*support'],
-             ['inherit.*relation', 'class.*design', 'architecture.*design', 'prompt.*base'])
-        ]
-        
-        for user_patterns, memory_patterns in concept_mappings:
-            user_match = False
-            memory_match = False
-            
-            # 检查用户消息中的概念
-            for pattern in user_patterns:
-                if re.search(pattern, full_message_lower) or any(pattern.replace('.*', ' ') in phrase for phrase in user_phrases):
-                    user_match = True
-                    break
-            
-            # 检查记忆中的相关解决方案
-            for pattern in memory_patterns:
-                if re.search(pattern, memory_text):
-                    memory_match = True
+        # 用户消息中的复合概念按消息预先识别，这里只在记忆中寻找语义相关的解决方案：
+        # 字面片段未全部出现时直接跳过，只有'a.*b'类模式才需要再用正则确认片段顺序
+        for concept_index in features.active_concepts:
+            for parts_mask, regex in _CONCEPT_MEMORY_CHECKS[concept_index]:
+                if memory_mask & parts_mask == parts_mask and (regex is None or regex.search(memory_text)):
+                    semantic_score += 4.0  # 每个复合概念匹配得4分
                     break
-            
-            # 复合概念匹配给予更高分数
-            if user_match and memory_match:
-                semantic_score += 4.0  # 每个复合概念匹配得4分
         
         # 4. 技术栈相关性 (0-5分)
         # 检查技术栈的匹配度
-        tech_stack_keywords = ['dto', 'entity', 'controller', 'service', 'repository', 'database',
-                              'validation', 'routing', 'prefix', 'inheritance', 'polymorphism']
-        
-        tech_matches = sum(1 for tech in tech_stack_keywords 
-                          if tech in full_message_lower and tech in memory_text)
+        tech_matches = _popcount(features.tech_mask & memory_mask)
         semantic_score += min(5, tech_matches)
         
         return semantic_score
     
+    def _message_features(self, full_message: str, message_keywords: List[str]) -> '_MessageFeatures':
+        """获取消息的派生数据；同一条消息对多条记忆评分时复用上一次的结果"""
+        features = self._last_message_features
+        key = (full_message, tuple(message_keywords))
+        if features is None or features.key != key:
+            text = full_message.lower()
+            keyword_set = frozenset(message_keywords)
+            phrases = tuple(" ".join(message_keywords[i:i+2]) for i in range(len(message_keywords) - 1))
+            domain_concepts = keyword_set & _DOMAIN_KEYWORDS
+            message_problem_mask = 0
+            for keyword in keyword_set:
+                message_problem_mask |= _PROBLEM_BITS.get(keyword, 0)
+            features = _MessageFeatures(
+                key=key,
+                text=text,
+                keyword_set=keyword_set,
+                phrases=phrases,
+                matcher=KeywordMatcher(message_keywords + list(phrases)),
+                count_hits=_build_hit_counter(message_keywords, phrases),
+                domain_mask=sum(_SEMANTIC_BITS[kw] for kw in domain_concepts),
+                domain_count=sum(1 for kw in message_keywords if kw in _DOMAIN_KEYWORDS),
+                solution_masks=tuple(
+                    solution_mask
+                    for problem_mask, solution_mask in zip(_PROBLEM_MASKS, _SOLUTION_MASKS)
+                    if problem_mask & message_problem_mask
+                ),
+                tech_mask=sum(_SEMANTIC_BITS[tech] for tech in set(_TECH_STACK_KEYWORDS) if tech in text),
+                active_concepts=self._match_message_concepts(text)
+            )
+            self._last_message_features = features
+        return features
+    
+    @staticmethod
+    def _match_message_concepts(message_lower: str) -> Tuple[int, ...]:
+        """识别用户消息中出现的复合概念，返回其在_CONCEPT_MAPPINGS中的下标"""
+        # 用户侧模式只由字面片段和'.*'组成：片段以空格相连出现在消息的某个短语中时，
+        # 正则本身也必然能在消息中匹配，因此只需在消息上做一次正则搜索，无需再提取短语
+        # 先做廉价的子串判断，所有片段都出现后才用正则确认顺序
+        active = []
+        for index, user_checks in enumerate(_CONCEPT_USER_CHECKS):
+            for parts, regex in user_checks:
+                if all(part in message_lower for part in parts) and (regex is None or regex.search(message_lower)):
+                    active.append(index)
+                    break
+        return tuple(active)
+    
     def get_scoring_performance_stats(self) -> Dict:
         """获取评分引擎性能统计"""
         if self.enable_optimized_scoring and self._optimized_scoring_engine:
-            return self._optimized_scoring_engine.get_performance_stats()
-        return {'message': '优化评分引擎未启用'}
+            stats = dict(self._optimized_scoring_engine.get_performance_stats())
+        else:
+            stats = {'message': '优化评分引擎未启用'}
+        
+        hits = self._relevance_cache_stats['hits']
+        total = hits + self._relevance_cache_stats['misses']
+        stats['relevance_cache_hits'] = hits
+        stats['relevance_cache_misses'] = self._relevance_cache_stats['misses']
+        stats['relevance_cache_hit_rate'] = f"{hits / total * 100:.1f}%" if total else "0.0%"
+        stats['relevance_cache_size'] = len(self._relevance_score_cache)
+        return stats
     
     def save_scoring_engine_state(self):
         """保存评分引擎状态"""
@@ -993,22 +1664,11 @@ class ContextProcessor:
         """更新关键词权重"""
         if self.enable_optimized_scoring and self._optimized_scoring_engine:
             self._optimized_scoring_engine.update_keyword_weight(keyword, dimension, weight, confidence)
+            # 权重变化会影响记忆排序，之前生成的上下文不再有效
+            self._context_cache.clear()
             print(f"✅ 关键词权重已更新: {keyword} ({dimension}) = {weight}")
         else:
             print("⚠️ 优化评分引擎未启用，无法更新权重")
-    
-    def _get_unmatched_memories(self, memories: List[MemoryEntry], stages: List[str]) -> List[MemoryEntry]:
-        """获取未匹配到任何阶段的记忆"""
-        matched_memory_ids = set()
-        
-        # 收集所有已匹配的记忆ID
-        for stage in stages:
-            stage_memories = self._find_memories_for_stage(memories, stage)
-            matched_memory_ids.update(m.id for m in stage_memories)
-        
-        # 返回未匹配的记忆
-        unmatched = [m for m in memories if m.id not in matched_memory_ids]
-        return sorted(unmatched, key=lambda m: m.importance, reverse=True)
 
 
 # 便捷函数
@@ -1025,7 +1685,7 @@ def create_memory_only_config(team_name: str, project_name: str = None, **kwargs
 def create_framework_only_config(team_name: str, project_name: str = None, stages: List[str] = None, **kwargs) -> ContextGenerationConfig:
     """创建仅框架模式的配置"""
     if stages is None:
-        stages = ["requirements", "business-model", "solution", "structure", "tasks", "common-tasks", "constraints"]
+        stages = list(_DEFAULT_FRAMEWORK_STAGES)
     
     return ContextGenerationConfig(
         team_name=team_name,
@@ -1039,7 +1699,7 @@ def create_framework_only_config(team_name: str, project_name: str = None, stage
 def create_hybrid_config(team_name: str, project_name: str = None, stages: List[str] = None, **kwargs) -> ContextGenerationConfig:
     """创建混合模式的配置"""
     if stages is None:
-        stages = ["requirements", "business-model", "solution", "structure", "tasks", "common-tasks", "constraints"]
+        stages = list(_DEFAULT_FRAMEWORK_STAGES)
     
     return ContextGenerationConfig(
         team_name=team_name,
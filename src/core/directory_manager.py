@@ -8,11 +8,147 @@ ContextX团队目录结构管理器
 """
 
 import os
+import re
+import copy
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 from datetime import datetime
 
+# 可选依赖：orjson加速配置文件序列化
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 团队/项目名称只允许字母、数字、连字符和下划线
+_NAME_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+# 按mtime判断文件或目录是否变化的缓存，只在mtime距今超过该时长（纳秒）后才写入：
+# 文件系统时间戳有粒度，同一时间片内的再次修改不会改变mtime
+MTIME_SETTLE_NS = 2_000_000_000
+
+# 修复时待检查的文件数超过该值才使用线程池并行写入，文件较少时线程调度开销得不偿失
+PARALLEL_REPAIR_MIN_FILES = 4
+PARALLEL_REPAIR_MAX_WORKERS = 8
+
+# 新建团队配置中的默认阶段和设置
+_CONTEXT_STAGES = (
+    'requirements',
+    'business-model',
+    'solution',
+    'structure',
+    'tasks',
+    'common-tasks',
+    'constraints'
+)
+_BASE_TEAM_SETTINGS = {
+    'memory_retention_days': 365,
+    'auto_context_generation': True,
+}
+
+
+def _mtime_settled(mtime_ns: int) -> bool:
+    """mtime距今已超过MTIME_SETTLE_NS，之后的修改必然产生不同的mtime，基于它的缓存可以安全写入"""
+    return time.time_ns() - mtime_ns >= MTIME_SETTLE_NS
+
+
+def _dumps_config(config: Dict) -> str:
+    """将配置序列化为缩进2格的JSON文本，优先使用orjson"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # 超大整数等orjson不支持的数据回退到标准库
+            pass
+    return json.dumps(config, indent=2, ensure_ascii=False)
+
+
+def _loads_config(text: str) -> Dict:
+    """解析配置JSON文本，优先使用orjson"""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity等标准库接受而orjson拒绝的写法交给标准库处理
+            pass
+    return json.loads(text)
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """先写入同目录下的临时文件再原子替换，写入中途失败不会留下半截的目标文件"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _flatten_structure(structure: Mapping, prefix: Tuple[str, ...] = ()
+                       ) -> List[Tuple[str, str, str, Optional[bytes]]]:
+    """
+    把目录结构模板展开成按创建顺序排列的 (结果键, 相对路径, 类型, 文件内容) 列表
+    
+    以'/'结尾的名称或内容为映射的条目是目录（类型'dir'），字符串内容是文件（类型'file'），
+    文件内容预先编码为UTF-8字节，写入时无需再编码；
+    内容为None的条目（如config.json）由调用方单独生成，不在列表中。
+    结果键是validate_team_structure结果中的键（保留目录名末尾的'/'），
+    相对路径已去掉末尾的'/'并按本机分隔符拼好，可直接交给os.path.join。
+    """
+    plan = []
+    for name, content in structure.items():
+        parts = prefix + (name.rstrip('/'),)
+        key = '/'.join(prefix + (name,))
+        rel_path = os.path.join(*parts)
+        if name.endswith('/') or isinstance(content, Mapping):
+            plan.append((key, rel_path, 'dir', None))
+            if isinstance(content, Mapping):
+                plan.extend(_flatten_structure(content, parts))
+        elif content is not None:
+            plan.append((key, rel_path, 'file', content.encode('utf-8')))
+    return plan
+
+
+def _write_new_file(path: str, data: bytes) -> bool:
+    """
+    以O_EXCL方式创建文件并写入内容
+    
+    存在检查和创建在同一次open中完成，文件已存在时不覆盖并返回False。
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    return True
+
+
+def _freeze_structure(structure: Mapping) -> Mapping:
+    """把嵌套的目录结构模板逐层包装为只读映射"""
+    return MappingProxyType({
+        name: _freeze_structure(content) if isinstance(content, Mapping) else content
+        for name, content in structure.items()
+    })
+
+
+def _leaf_dirs(plan) -> Tuple[str, ...]:
+    """从展开后的模板中取出叶子目录，makedirs叶子目录时会一并创建其上级目录"""
+    dirs = [rel_path for _, rel_path, kind, _ in plan if kind == 'dir']
+    return tuple(
+        d for d in dirs
+        if not any(other.startswith(d + os.sep) for other in dirs)
+    )
+
 
 class DirectoryManager:
     """团队目录结构管理器"""
@@ -56,6 +192,16 @@ class DirectoryManager:
         'config.json': None  # 将动态生成
     }
     
+    # 模板冻结为只读映射，避免被外部意外修改后与下面预先展开的列表不一致
+    TEAM_STRUCTURE = _freeze_structure(TEAM_STRUCTURE)
+    PROJECT_STRUCTURE = _freeze_structure(PROJECT_STRUCTURE)
+    
+    # 模板是类常量，类加载时展开一次，创建、验证和修复时直接按列表顺序处理
+    _TEAM_PLAN = tuple(_flatten_structure(TEAM_STRUCTURE))
+    _PROJECT_PLAN = tuple(_flatten_structure(PROJECT_STRUCTURE))
+    _TEAM_LEAF_DIRS = _leaf_dirs(_TEAM_PLAN)
+    _PROJECT_LEAF_DIRS = _leaf_dirs(_PROJECT_PLAN)
+    
     def __init__(self, root_path: Union[str, Path] = None):
         """
         初始化目录管理器
@@ -70,11 +216,17 @@ class DirectoryManager:
         self.teams_path = self.root_path / 'teams'
         self.global_path = self.root_path / 'global'
         
-        # 确保根目录存在
-        self._ensure_root_structure()
+        # 解析后的配置缓存：{配置路径: ((mtime_ns, 大小), 配置字典)}
+        self._config_cache: Dict[Path, Tuple[Tuple[int, int], Dict]] = {}
+        
+        # 根目录结构延迟到首次写操作时创建，只读操作不产生mkdir
+        self._root_ensured = False
     
     def _ensure_root_structure(self) -> None:
         """确保根目录结构存在"""
+        if self._root_ensured:
+            return
+        
         self.root_path.mkdir(exist_ok=True)
         self.teams_path.mkdir(exist_ok=True)
         self.global_path.mkdir(exist_ok=True)
@@ -82,6 +234,8 @@ class DirectoryManager:
         # 创建全局目录结构
         (self.global_path / 'templates').mkdir(exist_ok=True)
         (self.global_path / 'standards').mkdir(exist_ok=True)
+        
+        self._root_ensured = True
     
     def create_team(self, team_name: str, description: str = "", 
                    members: List[str] = None) -> Path:
@@ -104,6 +258,7 @@ class DirectoryManager:
         if not self._validate_team_name(team_name):
             raise ValueError(f"无效的团队名称: {team_name}")
         
+        self._ensure_root_structure()
         team_path = self.teams_path / team_name
         
         # 检查团队是否已存在
@@ -124,93 +279,131 @@ class DirectoryManager:
         if not team_name:
             return False
         
-        # 只允许字母、数字、连字符和下划线
-        allowed_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_')
-        return all(c in allowed_chars for c in team_name)
+        return _NAME_RE.fullmatch(team_name) is not None
     
     def _create_team_structure(self, team_path: Path) -> None:
         """创建团队目录结构"""
-        def create_structure(base_path: Path, structure: Dict):
-            for name, content in structure.items():
-                path = base_path / name
-                
-                if name.endswith('/'):
-                    # 目录
-                    path.mkdir(exist_ok=True)
-                    if isinstance(content, dict):
-                        create_structure(path, content)
-                elif content is None:
-                    # 跳过，稍后处理
-                    continue
-                elif isinstance(content, str):
-                    # 文件内容
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                    if not path.exists():
-                        path.write_text(content, encoding='utf-8')
-                elif isinstance(content, dict):
-                    # 这是一个目录，但名称没有以'/'结尾
-                    path.mkdir(parents=True, exist_ok=True)
-                    create_structure(path, content)
-        
-        create_structure(team_path, self.TEAM_STRUCTURE)
+        self._create_from_plan(team_path, self._TEAM_PLAN, self._TEAM_LEAF_DIRS)
+    
+    @staticmethod
+    def _create_from_plan(base_path: Path, plan, leaf_dirs) -> None:
+        """按展开后的模板创建目录和文件，已存在的文件不覆盖"""
+        # 模板遍历只用字符串路径，避免为每个条目构造Path对象
+        base = os.fspath(base_path)
+        
+        # 只对叶子目录makedirs，中间目录随之创建
+        for rel_path in leaf_dirs:
+            os.makedirs(os.path.join(base, rel_path), exist_ok=True)
+        
+        for _, rel_path, kind, content in plan:
+            if kind == 'file':
+                _write_new_file(os.path.join(base, rel_path), content)
+    
+    @staticmethod
+    def _repair_from_plan(base_path: Path, plan) -> List[str]:
+        """按展开后的模板补齐缺失的目录和文件，返回修复记录"""
+        base = os.fspath(base_path)
+        messages: List[Optional[str]] = [None] * len(plan)
+        
+        # 目录必须先于其下的文件创建，按顺序处理
+        file_jobs = []
+        for index, (_, rel_path, kind, content) in enumerate(plan):
+            full_path = os.path.join(base, rel_path)
+            if kind == 'dir':
+                if not os.path.exists(full_path):
+                    os.makedirs(full_path, exist_ok=True)
+                    messages[index] = f"创建目录: {full_path}"
+            else:
+                file_jobs.append((index, full_path, content))
+        
+        # 文件之间互不依赖，较多时并行写入以重叠每次I/O的等待（网络存储上尤为明显）
+        paths = [path for _, path, _ in file_jobs]
+        contents = [content for _, _, content in file_jobs]
+        if len(file_jobs) > PARALLEL_REPAIR_MIN_FILES:
+            workers = min(PARALLEL_REPAIR_MAX_WORKERS, len(file_jobs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                created = list(executor.map(_write_new_file, paths, contents))
+        else:
+            created = [_write_new_file(path, content) for path, content in zip(paths, contents)]
+        
+        for (index, full_path, _), was_created in zip(file_jobs, created):
+            if was_created:
+                messages[index] = f"创建文件: {full_path}"
+        
+        # 修复记录保持模板顺序
+        return [message for message in messages if message is not None]
     
     def _generate_team_config(self, team_name: str, description: str, 
                             members: List[str]) -> Dict:
         """生成团队配置"""
+        now = datetime.now().isoformat()
         return {
             'name': team_name,
             'description': description,
             'members': members,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
+            'created_at': now,
+            'updated_at': now,
             'version': '1.0.0',
             'settings': {
-                'memory_retention_days': 365,
-                'auto_context_generation': True,
-                'context_stages': [
-                    'requirements',
-                    'business-model', 
-                    'solution',
-                    'structure',
-                    'tasks',
-                    'common-tasks',
-                    'constraints'
-                ]
+                **_BASE_TEAM_SETTINGS,
+                # 每个配置一份独立的列表，修改配置不会影响模块常量
+                'context_stages': list(_CONTEXT_STAGES)
             }
         }
     
     def _write_team_config(self, team_path: Path, config: Dict) -> None:
         """写入团队配置文件"""
         config_path = team_path / 'config.json'
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        _write_text_atomic(config_path, _dumps_config(config))
+        
+        # 刚写入的文件mtime尚未稳定，不能写入缓存；丢弃旧条目，下次读取时重新加载
+        self._config_cache.pop(config_path, None)
     
-    def get_team_path(self, team_name: str) -> Path:
-        """获取团队目录路径"""
-        team_path = self.teams_path / team_name
-        if not team_path.exists():
-            raise FileNotFoundError(f"团队 '{team_name}' 不存在")
-        return team_path
+    def _read_config_json(self, config_path: Path) -> Dict:
+        """
+        读取并解析配置文件
+        
+        解析结果按 (mtime, 大小) 缓存，未变化时只做一次stat、不读取也不解析；
+        mtime距今不足MTIME_SETTLE_NS的文件不缓存。返回缓存的深拷贝，调用方可以随意修改。
+        
+        Raises:
+            FileNotFoundError: 配置文件不存在
+        """
+        st = config_path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._config_cache.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+        
+        config = _loads_config(config_path.read_text(encoding='utf-8'))
+        if _mtime_settled(st.st_mtime_ns):
+            self._config_cache[config_path] = (signature, copy.deepcopy(config))
+        return config
     
     def list_teams(self) -> List[str]:
         """列出所有团队"""
-        teams = []
-        if self.teams_path.exists():
-            for item in self.teams_path.iterdir():
-                if item.is_dir() and (item / 'config.json').exists():
-                    teams.append(item.name)
-        return sorted(teams)
+        # DirEntry.is_dir(follow_symlinks=False)直接使用readdir返回的类型信息，不跟随符号链接，
+        # 每个条目只需再检查一次config.json
+        try:
+            with os.scandir(self.teams_path) as entries:
+                teams = [
+                    entry.name for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and os.path.isfile(os.path.join(entry.path, 'config.json'))
+                ]
+        except FileNotFoundError:
+            return []
+        teams.sort()
+        return teams
     
     def get_team_config(self, team_name: str) -> Dict:
         """获取团队配置"""
-        team_path = self.get_team_path(team_name)
+        team_path = self._team_path(team_name)
         config_path = team_path / 'config.json'
         
-        if not config_path.exists():
-            raise FileNotFoundError(f"团队 '{team_name}' 配置文件不存在")
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        try:
+            return self._read_config_json(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"团队 '{team_name}' 配置文件不存在") from None
     
     def update_team_config(self, team_name: str, updates: Dict) -> None:
         """更新团队配置"""
@@ -218,12 +411,12 @@ class DirectoryManager:
         config.update(updates)
         config['updated_at'] = datetime.now().isoformat()
         
-        team_path = self.get_team_path(team_name)
+        team_path = self._team_path(team_name)
         self._write_team_config(team_path, config)
     
     def get_memory_path(self, team_name: str, memory_type: str = 'declarative') -> Path:
         """获取团队记忆文件路径"""
-        team_path = self.get_team_path(team_name)
+        team_path = self._team_path(team_name)
         
         if memory_type == 'episodic':
             return team_path / 'memory' / 'episodic'
@@ -232,75 +425,70 @@ class DirectoryManager:
     
     def get_context_path(self, team_name: str, stage: str) -> Path:
         """获取团队上下文文件路径"""
-        team_path = self.get_team_path(team_name)
+        team_path = self._team_path(team_name)
         return team_path / 'context' / f'{stage}.md'
     
-    def get_project_path(self, team_name: str, project_name: str) -> Path:
-        """获取项目上下文路径"""
-        team_path = self.get_team_path(team_name)
-        project_path = team_path / 'projects' / project_name
-        project_path.mkdir(parents=True, exist_ok=True)
-        return project_path
-    
     def validate_team_structure(self, team_name: str) -> Dict[str, bool]:
-        """验证团队目录结构完整性"""
-        team_path = self.get_team_path(team_name)
+        """
+        验证团队目录结构完整性
+
+        结果键是模板条目的相对路径（如'memory'、'memory/declarative.md'、'projects/'），
+        目录条目检查是否为目录，文件条目检查是否为文件；
+        某个目录缺失时，其下所有条目直接记为False，不再访问文件系统。
+        """
+        team_path = self._team_path(team_name)
         validation_result = {}
         
-        def validate_structure(base_path: Path, structure: Dict, result_path: str = ""):
-            for name, content in structure.items():
-                current_path = f"{result_path}/{name}" if result_path else name
-                path = base_path / name
-                
-                if name.endswith('/'):
-                    # 目录
-                    result = path.exists() and path.is_dir()
-                    validation_result[current_path] = result
-                    
-                    if result and isinstance(content, dict):
-                        validate_structure(path, content, current_path.rstrip('/'))
-                elif content is not None:
-                    # 文件
-                    validation_result[current_path] = path.exists() and path.is_file()
-        
-        validate_structure(team_path, self.TEAM_STRUCTURE)
+        # 模板按深度优先展开，缺失目录下的条目直接记为缺失，不再stat
+        team_dir = os.fspath(team_path)
+        missing_dirs = set()
+        for key, rel_path, kind, _ in self._TEAM_PLAN:
+            if os.path.dirname(rel_path) in missing_dirs:
+                if kind == 'dir':
+                    missing_dirs.add(rel_path)
+                validation_result[key] = False
+                continue
+            full_path = os.path.join(team_dir, rel_path)
+            if kind == 'dir':
+                result = os.path.isdir(full_path)
+                if not result:
+                    missing_dirs.add(rel_path)
+            else:
+                result = os.path.isfile(full_path)
+            validation_result[key] = result
+        
         return validation_result
     
     def repair_team_structure(self, team_name: str) -> List[str]:
         """修复团队目录结构"""
-        team_path = self.get_team_path(team_name)
-        repaired = []
-        
-        def repair_structure(base_path: Path, structure: Dict):
-            for name, content in structure.items():
-                path = base_path / name
-                
-                if name.endswith('/'):
-                    # 目录
-                    if not path.exists():
-                        path.mkdir(parents=True, exist_ok=True)
-                        repaired.append(f"创建目录: {path}")
-                    
-                    if isinstance(content, dict):
-                        repair_structure(path, content)
-                elif content is not None:
-                    # 文件
-                    if not path.exists():
-                        path.parent.mkdir(parents=True, exist_ok=True)
-                        path.write_text(content, encoding='utf-8')
-                        repaired.append(f"创建文件: {path}")
-        
-        repair_structure(team_path, self.TEAM_STRUCTURE)
-        return repaired
-    
-    def get_team_path(self, team_name: str) -> Path:
-        """获取团队路径"""
+        self._ensure_root_structure()
+        team_path = self._team_path(team_name)
+        return self._repair_from_plan(team_path, self._TEAM_PLAN)
+    
+    def _team_path(self, team_name: str) -> Path:
+        """拼接团队路径，不访问文件系统"""
         return self.teams_path / team_name
     
+    def get_team_path(self, team_name: str, check_exists: bool = False) -> Path:
+        """
+        获取团队路径
+        
+        Args:
+            team_name: 团队名称
+            check_exists: 是否检查团队目录存在，默认不检查
+            
+        Raises:
+            FileNotFoundError: check_exists为True且团队不存在
+        """
+        team_path = self.teams_path / team_name
+        if check_exists and not team_path.is_dir():
+            raise FileNotFoundError(f"团队 '{team_name}' 不存在")
+        return team_path
+    
     def team_exists(self, team_name: str) -> bool:
         """检查团队是否存在"""
-        team_path = self.get_team_path(team_name)
-        return team_path.exists() and team_path.is_dir()
+        # isdir对不存在的路径返回False，一次stat即可
+        return os.path.isdir(self._team_path(team_name))
     
     # === 项目级别管理方法 ===
     
@@ -329,6 +517,7 @@ class DirectoryManager:
         if not self._validate_team_name(project_name):  # 复用团队名称验证逻辑
             raise ValueError(f"无效的项目名称: {project_name}")
         
+        self._ensure_root_structure()
         project_path = self.get_project_path(team_name, project_name)
         
         # 检查项目是否已存在
@@ -346,51 +535,27 @@ class DirectoryManager:
     
     def get_project_path(self, team_name: str, project_name: str) -> Path:
         """获取项目目录路径"""
-        return self.get_team_path(team_name) / "projects" / project_name
+        return self._team_path(team_name) / "projects" / project_name
     
     def project_exists(self, team_name: str, project_name: str) -> bool:
         """检查项目是否存在"""
-        return self.get_project_path(team_name, project_name).exists()
+        return os.path.isdir(self.get_project_path(team_name, project_name))
     
     def list_projects(self, team_name: str) -> List[str]:
         """列出团队下的所有项目"""
-        if not self.team_exists(team_name):
-            return []
+        projects_dir = self._team_path(team_name) / "projects"
         
-        projects_dir = self.get_team_path(team_name) / "projects"
-        if not projects_dir.exists():
+        # 团队或projects目录不存在时scandir直接报错，无需预先检查
+        try:
+            with os.scandir(projects_dir) as entries:
+                return [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        
-        return [p.name for p in projects_dir.iterdir() if p.is_dir()]
     
     def _create_project_structure(self, project_path: Path) -> None:
         """创建项目目录结构"""
-        def create_structure(base_path: Path, structure: Dict):
-            for name, content in structure.items():
-                path = base_path / name
-                
-                if name.endswith('/'):
-                    # 目录
-                    path.mkdir(exist_ok=True)
-                    if isinstance(content, dict):
-                        create_structure(path, content)
-                elif isinstance(content, dict):
-                    # 嵌套字典表示子目录结构
-                    path.mkdir(exist_ok=True)
-                    create_structure(path, content)
-                else:
-                    # 文件
-                    if content is not None:
-                        path.write_text(content, encoding='utf-8')
-                    elif name == 'config.json':
-                        # config.json需要特殊处理，跳过这里，在后面单独创建
-                        pass
-        
-        # 创建项目根目录
-        project_path.mkdir(parents=True, exist_ok=True)
-        
-        # 创建项目结构
-        create_structure(project_path, self.PROJECT_STRUCTURE)
+        # 叶子目录的makedirs会一并创建项目根目录
+        self._create_from_plan(project_path, self._PROJECT_PLAN, self._PROJECT_LEAF_DIRS)
     
     def _generate_project_config(self, project_name: str, description: str) -> Dict:
         """生成项目配置"""
@@ -410,39 +575,10 @@ class DirectoryManager:
     def _write_project_config(self, project_path: Path, config: Dict) -> None:
         """写入项目配置文件"""
         config_path = project_path / 'config.json'
-        config_path.write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding='utf-8')
+        _write_text_atomic(config_path, _dumps_config(config))
     
     def repair_project_structure(self, team_name: str, project_name: str) -> List[str]:
         """修复项目目录结构"""
+        self._ensure_root_structure()
         project_path = self.get_project_path(team_name, project_name)
-        repaired = []
-        
-        def repair_structure(base_path: Path, structure: Dict):
-            for name, content in structure.items():
-                path = base_path / name
-                
-                if name.endswith('/'):
-                    # 目录
-                    if not path.exists():
-                        path.mkdir(parents=True, exist_ok=True)
-                        repaired.append(f"创建目录: {path}")
-                    
-                    if isinstance(content, dict):
-                        repair_structure(path, content)
-                elif isinstance(content, dict):
-                    # 嵌套字典表示子目录结构
-                    if not path.exists():
-                        path.mkdir(parents=True, exist_ok=True)
-                        repaired.append(f"创建目录: {path}")
-                    repair_structure(path, content)
-                else:
-                    # 文件
-                    if not path.exists() and content is not None:
-                        path.write_text(content, encoding='utf-8')
-                        repaired.append(f"创建文件: {path}")
-                    elif name == 'config.json' and not path.exists():
-                        # config.json需要特殊处理，跳过这里
-                        pass
-        
-        repair_structure(project_path, self.PROJECT_STRUCTURE)
-        return repaired 
\ No newline at end of file
+        return self._repair_from_plan(project_path, self._PROJECT_PLAN)
@@ -0,0 +1,70 @@
+"""
+ContextX多关键词匹配器
+
+在一段文本中一次性查找多个关键词（子串匹配），支持：
+- 基于Aho-Corasick自动机的单次线性扫描（需要安装pyahocorasick）
+- 未安装pyahocorasick时回退到逐个关键词的子串查找
+"""
+
+from typing import Iterable, Iterator, List, Set, Tuple
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+class KeywordMatcher:
+    """多关键词子串匹配器
+
+    匹配区分大小写，调用方需要自行统一关键词和文本的大小写。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        初始化匹配器
+
+        Args:
+            keywords: 关键词列表，重复和空字符串会被忽略
+        """
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+
+        self._automaton = None
+        if HAS_AHOCORASICK and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def iter(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        按结束位置顺序返回文本中每一次关键词出现
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            (关键词最后一个字符的下标, 关键词) 迭代器
+        """
+        if not text or not self.keywords:
+            return iter(())
+
+        if self._automaton is not None:
+            return self._automaton.iter(text)
+
+        hits: List[Tuple[int, str]] = []
+        for keyword in self.keywords:
+            start = text.find(keyword)
+            while start != -1:
+                hits.append((start + len(keyword) - 1, keyword))
+                start = text.find(keyword, start + 1)
+        hits.sort()
+        return iter(hits)
+
+    def matches(self, text: str) -> Set[str]:
+        """返回文本中出现过的关键词集合"""
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        return {keyword for keyword in self.keywords if keyword in text}
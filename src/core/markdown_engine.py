@@ -8,14 +8,39 @@ ContextX Markdown存储引擎
 - 内容的搜索和过滤
 """
 
+import os
 import re
 import json
+import mmap
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from dataclasses import dataclass
 
 
+# 记忆文件达到该大小时通过mmap直接解码，省去read()产生的中间bytes副本
+MMAP_MIN_FILE_SIZE = 64 * 1024
+
+
+def _read_memory_text(file_path: Path) -> Optional[str]:
+    """读取记忆文件为文本，换行符与read_text一样统一为\\n；文件不存在时返回None"""
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN_FILE_SIZE:
+            # 直接从映射区解码，不经过完整的bytes对象
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8')
+        else:
+            text = f.read().decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
 @dataclass
 class MemoryEntry:
     """记忆条目数据结构"""
@@ -28,6 +53,9 @@ class MemoryEntry:
     metadata: Dict[str, Any] = None
     source: str = 'team'  # 新增：记忆来源标识（team, project:xxx）
     
+    # 记忆类型由加载方按来源文件设置；类属性提供默认值，不作为dataclass字段参与构造和导出
+    memory_type = 'declarative'
+    
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
@@ -67,10 +95,10 @@ class MarkdownEngine:
         Returns:
             记忆条目列表
         """
-        if not file_path.exists():
+        content = _read_memory_text(file_path)
+        if content is None:
             return []
         
-        content = file_path.read_text(encoding='utf-8')
         entries = []
         
         # 使用正则表达式匹配记忆条目
@@ -398,10 +426,10 @@ class MarkdownEngine:
         Returns:
             记忆条目列表
         """
-        if not file_path.exists():
+        content = _read_memory_text(file_path)
+        if content is None:
             return []
         
-        content = file_path.read_text(encoding='utf-8')
         entries = []
         
         # 使用正则表达式匹配记忆条目
@@ -12,6 +12,7 @@
 import asyncio
 import hashlib
 import json
+import re
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -24,6 +25,15 @@ import threading
 from .markdown_engine import MemoryEntry
 
 
+# 关键词提取使用的正则在导入时编译一次
+_TECH_KEYWORD_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(?:api|workflow|database|service|authentication|authorization)\b',
+    r'\b(?:management|architecture|implementation|configuration)\b',
+    r'\b(?:validation|design|model|framework|solution)\b'
+))
+_ENGLISH_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
 @dataclass
 class CachedScore:
     """缓存的评分结果"""
@@ -66,6 +76,7 @@ class OptimizedScoringEngine:
         
         # 内存缓存
         self._score_cache: Dict[str, CachedScore] = {}
+        self._last_message_keywords: Optional[Tuple[str, List[str]]] = None
         self._precomputed_weights: Dict[str, PrecomputedWeight] = {}
         self._cache_lock = threading.RLock()
         
@@ -343,8 +354,8 @@ class OptimizedScoringEngine:
         matched_keywords = []
         key_strengths = []
         
-        # 提取关键词
-        message_keywords = self._extract_keywords(user_message.lower())
+        # 提取关键词（每条消息只提取一次，记忆的内容和标签各转换一次小写）
+        message_keywords = self._message_keywords(user_message)
         memory_content_lower = memory.content.lower()
         memory_tags_lower = [tag.lower() for tag in memory.tags]
         
@@ -367,8 +378,8 @@ class OptimizedScoringEngine:
         
         # 3. 项目匹配
         project_score = 0.0
-        if memory.project and memory.project.lower() != 'general':
-            project_lower = memory.project.lower()
+        project_lower = memory.project.lower() if memory.project else ''
+        if project_lower and project_lower != 'general':
             for keyword in message_keywords:
                 if keyword in project_lower:
                     project_score += 1.0
@@ -407,28 +418,26 @@ class OptimizedScoringEngine:
     
     def _extract_keywords(self, text: str) -> List[str]:
         """提取关键词（优化版本）"""
-        import re
-        
-        # 使用预定义的技术关键词模式
-        tech_patterns = [
-            r'\b(?:api|workflow|database|service|authentication|authorization)\b',
-            r'\b(?:management|architecture|implementation|configuration)\b',
-            r'\b(?:validation|design|model|framework|solution)\b'
-        ]
-        
         keywords = set()
         
         # 提取技术关键词
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            keywords.update(match.lower() for match in matches)
+        for pattern in _TECH_KEYWORD_PATTERNS:
+            keywords.update(match.lower() for match in pattern.findall(text))
         
         # 提取英文单词（长度>=3）
-        english_words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
-        keywords.update(word.lower() for word in english_words)
+        keywords.update(word.lower() for word in _ENGLISH_WORD_PATTERN.findall(text))
         
         return list(keywords)
     
+    def _message_keywords(self, user_message: str) -> List[str]:
+        """消息转小写并提取关键词；同一条消息会对所有候选记忆评分，结果按最近一条消息缓存"""
+        cached = self._last_message_keywords
+        if cached is not None and cached[0] == user_message:
+            return cached[1]
+        keywords = self._extract_keywords(user_message.lower())
+        self._last_message_keywords = (user_message, keywords)
+        return keywords
+    
     def _cleanup_expired_cache(self):
         """清理过期缓存"""
         expired_keys = [
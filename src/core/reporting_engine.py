@@ -9,6 +9,7 @@ ContextX高级报告引擎
 - 多种图表和可视化
 """
 
+import os
 import json
 import math
 from pathlib import Path
@@ -16,6 +17,7 @@ from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 import statistics
 
 from .directory_manager import DirectoryManager
@@ -23,6 +25,28 @@ from .markdown_engine import MarkdownEngine, MemoryEntry
 from .advanced_search import AdvancedSearchEngine
 from .collaboration_manager import CollaborationManager
 
+# 记忆文件数超过该值时使用线程池并行读取，文件较少时线程调度开销得不偿失
+PARALLEL_LOAD_MIN_FILES = 4
+PARALLEL_LOAD_MAX_WORKERS = 8
+
+# 可选依赖：orjson加速JSON报告序列化
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps_report(report_data: Dict[str, Any]) -> bytes:
+    """将报告序列化为缩进2格的UTF-8 JSON，优先使用orjson"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(report_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # 超大整数等orjson不支持的数据回退到标准库
+            pass
+    return json.dumps(report_data, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 @dataclass
 class ReportConfig:
@@ -73,7 +97,7 @@ class ReportingEngine:
         
         # 报告目录
         self.reports_dir = self.base_path / "reports"
-        self.reports_dir.mkdir(exist_ok=True)
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
         
         # 图表模板
         self.chart_templates = self._load_chart_templates()
@@ -321,14 +345,19 @@ class ReportingEngine:
         
         # 加载上下文文件
         contexts = {}
-        context_dir = team_path / "context"
-        if context_dir.exists():
-            for context_file in context_dir.glob("*.md"):
-                contexts[context_file.stem] = {
-                    'content': context_file.read_text(encoding='utf-8'),
-                    'size': context_file.stat().st_size,
-                    'modified': datetime.fromtimestamp(context_file.stat().st_mtime).isoformat()
-                }
+        # 一次scandir遍历上下文目录，每个文件只stat一次
+        try:
+            with os.scandir(team_path / "context") as entries:
+                context_entries = [entry for entry in entries if entry.name.endswith('.md')]
+        except (FileNotFoundError, NotADirectoryError):
+            context_entries = []
+        for entry in context_entries:
+            st = entry.stat()
+            contexts[entry.name[:-3]] = {
+                'content': Path(entry.path).read_text(encoding='utf-8'),
+                'size': st.st_size,
+                'modified': datetime.fromtimestamp(st.st_mtime).isoformat()
+            }
         
         # 收集协作数据
         collaboration_data = {
@@ -802,14 +831,23 @@ class ReportingEngine:
         ]
         
         # 加载情景性记忆
-        episodic_dir = team_path / "memory" / "episodic"
-        if episodic_dir.exists():
-            memory_files.extend(episodic_dir.glob("*.md"))
-        
-        for file_path in memory_files:
-            if file_path.exists():
-                file_memories = self.markdown_engine.load_memories(file_path)
-                memories.extend(file_memories)
+        try:
+            with os.scandir(team_path / "memory" / "episodic") as entries:
+                memory_files.extend(Path(entry.path) for entry in entries if entry.name.endswith('.md'))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        
+        # load_memories对不存在的文件返回空列表，无需预先检查
+        if len(memory_files) > PARALLEL_LOAD_MIN_FILES:
+            # 文件读取期间会释放GIL，多文件时并行读取以重叠I/O；map保持原有文件顺序
+            workers = min(PARALLEL_LOAD_MAX_WORKERS, len(memory_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.markdown_engine.load_memories, memory_files))
+        else:
+            results = [self.markdown_engine.load_memories(f) for f in memory_files]
+        
+        for file_memories in results:
+            memories.extend(file_memories)
         
         return memories
     
@@ -841,10 +879,7 @@ class ReportingEngine:
         elif config.output_format == 'json':
             filename = f"{team_name}_{report_data['report_type']}_{timestamp}.json"
             output_path = self.reports_dir / filename
-            output_path.write_text(
-                json.dumps(report_data, indent=2, ensure_ascii=False),
-                encoding='utf-8'
-            )
+            output_path.write_bytes(_dumps_report(report_data))
     
     # 占位符方法，用于其他功能
     def _generate_performance_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
@@ -299,12 +299,9 @@ class SevenStageEngine:
         if config.stage_dependencies and stage in self.STAGE_DEPENDENCIES:
             dependencies = self.STAGE_DEPENDENCIES[stage]
             if dependencies:
-                enhanced_sections.extend([
-                    "## Dependencies",
-                    "",
-                    *[f"- {dep.value}" for dep in dependencies],
-                    ""
-                ])
+                enhanced_sections.extend(("## Dependencies", ""))
+                enhanced_sections.extend(f"- {dep.value}" for dep in dependencies)
+                enhanced_sections.append("")
                 
                 # 添加依赖阶段的关键输出
                 for dep in dependencies:
@@ -335,12 +332,8 @@ class SevenStageEngine:
         
         # 添加记忆来源信息
         if context.source_memories:
-            enhanced_sections.extend([
-                "",
-                "## Memory Sources",
-                "",
-                *[f"- {memory_id}" for memory_id in context.source_memories]
-            ])
+            enhanced_sections.extend(("", "## Memory Sources", ""))
+            enhanced_sections.extend(f"- {memory_id}" for memory_id in context.source_memories)
         
         # 添加跨阶段洞察
         cross_insights = self._generate_cross_stage_insights(stage, previous_results)
@@ -130,7 +130,7 @@ class TemplateEngine:
         """
         self.base_path = Path(base_path)
         self.templates_dir = self.base_path / "templates"
-        self.templates_dir.mkdir(exist_ok=True)
+        self.templates_dir.mkdir(parents=True, exist_ok=True)
         
         # 模板缓存
         self.template_cache: Dict[str, Template] = {}